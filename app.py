@@ -1,525 +1,679 @@
-import streamlit as st
-import re
-import pandas as pd
-from PyPDF2 import PdfReader
-import matplotlib.pyplot as plt
-import tempfile
-
-# Page config
-st.set_page_config(page_title="📘 SLIIT Marks Analyzer", layout="wide")
-
-# 🔹 Apply outer frame and layout fix
-st.markdown("""
-    <style>
-        /* Limit max width & center all content */
-        .main {
-            padding-left: 300px !important;
-            padding-right: 300px !important;
-        }
-
-        /* Optional: Adjust spacing below inputs */
-        .element-container:has(.stTextInput) {
-            margin-bottom: 1.5rem;
-        }
-
-        /* Responsive breakpoints for smoother transitions */
-        
-        /* Large tablets and small desktops (1200px and below) */
-        @media (max-width: 1200px) {
-            .main {
-                padding-left: 200px !important;
-                padding-right: 200px !important;
-            }
-        }
-        
-        /* Medium tablets (992px and below) */
-        @media (max-width: 992px) {
-            .main {
-                padding-left: 100px !important;
-            padding-right: 100px !important;
-            }
-        }
-        
-        /* Small tablets (768px and below) */
-        @media (max-width: 768px) {
-            .main {
-                padding-left: 50px !important;
-                padding-right: 50px !important;
-            }
-        }
-        
-        /* Mobile devices (576px and below) */
-        @media (max-width: 576px) {
-            .main {
-                padding-left: 20px !important;
-                padding-right: 20px !important;
-            }
-        }
-    </style>
-""", unsafe_allow_html=True)
-
-
-with st.container():
-    st.title("📘 SLIIT Marks Analyzer")
-    st.markdown("Analyze student performance from exam PDFs with ranks, grades, and insights.")
-
-    uploaded_file = st.file_uploader("📂 Upload SLIIT Final Exam PDF File", type=["pdf"])
-
-if uploaded_file:
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        tmp_file.write(uploaded_file.read())
-        tmp_path = tmp_file.name
-
-    try:
-        reader = PdfReader(tmp_path)
-    except Exception:
-        st.error("❌ Unable to read the uploaded PDF. Ensure it's a valid exam report.")
-        st.stop()
-
-    text = ""
-    for page in reader.pages:
-        page_text = page.extract_text()
-        if page_text:
-            text += page_text + "\n"
-
-    # 🔹 Detect module
-    mod_match = re.search(r"(IT\d{4})\s*-\s*([^\n\-]+)", text)
-    module_code = mod_match.group(1).strip() if mod_match else "Unknown"
-    module_name = mod_match.group(2).strip() if mod_match else "Unknown"
-
-    st.markdown(f"### 🧾 Module: {module_code} - {module_name}")
-
-    # 🔹 Pattern 1: PDFs WITH CA marks (old behaviour)
-    pattern_with_ca = (
-        r"\b\d+\s+"
-        r"(IT\s?\d{2}\s?\d{4}\s?\d{2})"     # RegNo like 'IT 23 8313 22'
-        r"\s+"
-        r"(\d{1,3}(?:\.\d{1,2})?)"          # CA mark column
-        r"\s+"
-        r"([A-Z\+\-]+)"                     # Grade
-        r"\s+"
-        r"(Pass|Fail|IC)"                   # Status
-    )
-
-    matches = re.findall(pattern_with_ca, text)
-    has_ca_marks = True
-
-    # 🔹 Pattern 2: PDFs WITHOUT CA marks
-    if not matches:
-        pattern_no_ca = (
-            r"\b\d+\s+"
-            r"(IT\s?\d{2}\s?\d{4}\s?\d{2})"  # RegNo only
-            r"\s+"
-            r"([A-Z\+\-]+)"                  # Grade
-            r"\s+"
-            r"(Pass|Fail|IC)"                # Status
-        )
-        matches = re.findall(pattern_no_ca, text)
-        has_ca_marks = False
-
-    if not matches:
-        st.error("❌ No student data found. Please make sure to upload valid *SLIIT Final Exam PDF* files only.")
-        st.stop()
-
-    # 🔹 Build DataFrame depending on format
-    if has_ca_marks:
-        data = []
-        for reg_no, ca_percent, grade, status in matches:
-            clean_id = re.sub(r"\s+", "", reg_no.upper())
-            data.append([clean_id, float(ca_percent), grade, status])
-
-        df = pd.DataFrame(data, columns=["RegNo", "CAMarksPercent", "Grade", "Status"])
-    else:
-        # Grade-only PDFs (no CA column)
-        data = []
-        for reg_no, grade, status in matches:
-            clean_id = re.sub(r"\s+", "", reg_no.upper())
-            data.append([clean_id, grade, status])
-
-        df = pd.DataFrame(data, columns=["RegNo", "Grade", "Status"])
-
-    # -------------------------------------------------------------
-    # Common grade meta
-    # -------------------------------------------------------------
-    grade_ranges = {
-        "A+": (90, 100), "A": (80, 89), "A-": (75, 79),
-        "B+": (70, 74), "B": (65, 69), "B-": (60, 64),
-        "C+": (55, 59), "C": (45, 54), "C-": (40, 44),
-        "D+": (35, 39), "D": (30, 34), "E": (0, 29),
-        "F": (0, 29)
-    }
-
-    grade_order = {
-        "A+": 1, "A": 2, "A-": 3,
-        "B+": 4, "B": 5, "B-": 6,
-        "C+": 7, "C": 8, "C-": 9,
-        "D+": 10, "D": 11, "E": 12, "F": 13
-    }
-
-    grade_to_perf = {
-        "A+": "Excellent", "A": "Excellent", "A-": "Excellent",
-        "B+": "High Performer", "B": "High Performer",
-        "B-": "Average", "C+": "Average", "C": "Average",
-        "C-": "Below Average", "D+": "Below Average",
-        "D": "Below Average", "E": "Below Average", "F": "Below Average"
-    }
-
-    def performance_emoji(perf):
-        return {
-            # old categories (grade-only branch)
-            "Excellent": "🌟 Excellent",
-            "High Performer": "✅ High Performer",
-            "Average": "🟡 Average",
-            "Below Average": "🔻 Below Average",
-            # new combined CA + Total categories
-            "Dual Star": "🌟 Dual Star (CA & Final Strong)",
-            "Exam Booster": "📘 Exam Booster (Final > CA)",
-            "CA Anchor": "🧩 CA Anchor (CA > Final)",
-            "Developing": "🔻 Developing (Needs Support)"
-        }.get(perf, perf)
-
-    # -------------------------------------------------------------
-    # Branch 1: PDFs WITH CA marks
-    # -------------------------------------------------------------
-    if has_ca_marks:
-        # Module weight settings
-        sixty_forty = {"IT1010", "IT1050", "IT1090", "IT2020", "IT2060", "IT2050", "IT2070", "IT2090"}
-        fifty_fifty = {"IT1020", "IT1030", "IT1040", "IT1060", "IT1080", "IT1100", "IT2030", "IT2040", "IT2010", "IT2110"}
-
-        # Initialize session state for custom weight if not exists
-        if 'custom_ca_weight' not in st.session_state:
-            st.session_state.custom_ca_weight = 40
-
-        if module_code in sixty_forty:
-            ca_weight, final_weight = 0.4, 0.6
-            weight_info = "📊 **Weight Detected**: 60% Final + 40% CA"
-        elif module_code in fifty_fifty:
-            ca_weight, final_weight = 0.5, 0.5
-            weight_info = "📊 **Weight Detected**: 50% Final + 50% CA"
-        else:
-            st.warning(f"⚠️ Module {module_code} not recognized. Please set custom CA weight:")
-            custom_weight = st.number_input(
-                "Enter CA Weight %", 
-                min_value=0, 
-                max_value=100, 
-                value=st.session_state.custom_ca_weight,
-                step=5,
-                key="ca_weight_input"
-            )
-            st.session_state.custom_ca_weight = custom_weight
-            ca_weight = custom_weight / 100
-            final_weight = 1.0 - ca_weight
-            weight_info = f"📊 **Custom Weight**: {int(final_weight*100)}% Final + {int(ca_weight*100)}% CA"
-        
-        st.info(weight_info)
-
-        df["CA_Scaled"] = df["CAMarksPercent"] * ca_weight
-        df["FinalGrade"] = df["CA_Scaled"]
-
-        # 🔹 NEW: Performance uses BOTH CA and Total (from grade band midpoint)
-        grade_mid = {g: (lo + hi) / 2 for g, (lo, hi) in grade_ranges.items()}
-
-        def performance_category_combined(row):
-            ca = row["CAMarksPercent"]
-            approx_total = grade_mid.get(row["Grade"], ca)
-
-            if ca >= 70 and approx_total >= 70:
-                return "Dual Star"          # strong CA and strong final
-            elif ca < 70 and approx_total >= 70:
-                return "Exam Booster"       # exam pulled the grade up
-            elif ca >= 70 and approx_total < 70:
-                return "CA Anchor"          # CA is strong, final weaker
-            else:
-                return "Developing"         # both sides need work
-
-        df["Performance"] = df.apply(performance_category_combined, axis=1)
-
-        # Ranking
-        df_sorted = df.sort_values(by="CA_Scaled", ascending=False).reset_index(drop=True)
-        df_sorted["Rank"] = df_sorted.index + 1
-
-        # 🔍 Student search
-        reg_input = st.text_input("🔍 Enter Student ID Number", max_chars=20)
-
-        if reg_input:
-            cleaned = re.sub(r"[^A-Z0-9]", "", reg_input.upper())
-            matches_student = df_sorted[df_sorted["RegNo"].str.startswith(cleaned)]
-
-            if matches_student.empty:
-                st.warning("⚠ No matching registration found.")
-            elif len(matches_student) > 1:
-                st.info("Multiple matches found. Please enter full RegNo:")
-                st.markdown("Matching RegNos:")
-                for m in matches_student["RegNo"].tolist():
-                    st.markdown(f"- {m}")
-            else:
-                student = matches_student.iloc[0]
-                total = len(df_sorted)
-                rank = int(student["Rank"])
-                # show "Top X%" where X is small (better visual)
-                percentile = 100 * (rank / total)
-                avg = df_sorted["CA_Scaled"].mean()
-                ca_percent = student["CAMarksPercent"]
-                ca_scaled = ca_percent * ca_weight
-                grade = student["Grade"]
-                status = student["Status"]
-                perf = performance_emoji(student["Performance"])
-
-                min_total, max_total = grade_ranges.get(grade, (0, 0))
-                exam_min = ((min_total / 100) - ca_weight * (ca_percent / 100)) * 100 / final_weight
-                exam_max = ((max_total / 100) - ca_weight * (ca_percent / 100)) * 100 / final_weight
-
-                if exam_max > 100:
-                    exam_max = 100
-
-                st.markdown(f"""
-                    <h3>📊 Student Performance Report</h3>
-                    <table style="width: 100%; border-collapse: collapse;">
-                        <thead>
-                            <tr>
-                                <th style="text-align: left; padding: 8px;">Key</th>
-                                <th style="text-align: left; padding: 8px;">Value</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            <tr><td>🎓 RegNo</td><td>{student['RegNo']}</td></tr>
-                            <tr><td>🎯 Grade / 🧾 Status</td><td>{grade} &nbsp;|&nbsp; {status}</td></tr>
-                            <tr><td>📈 CA Marks / 🎯 Scaled CA</td><td><span style='color: green;'>{ca_percent:.2f}%</span> &nbsp;|&nbsp; <span style='color: green;'>{ca_scaled:.1f}</span> / {int(ca_weight * 100)}</td></tr>
-                            <tr><td>🎓 Rank (Based on CA marks)</td><td><span style='color: green;'>{rank}</span> / {total}</td></tr>
-                            <tr><td>📊 Top Percentile (Based on CA)</td><td>Top <span style='color: green;'>{percentile:.2f}%</span></td></tr>
-                            <tr><td>🧪 Final Exam Marks</td><td>Between <span style='color: green;'>{exam_min:.1f}</span> - <span style='color: green;'>{exam_max:.1f}</span></td></tr>
-                            <tr><td>🎯 Total Marks</td><td>Between <span style='color: green;'>{min_total:.2f}</span> - <span style='color: green;'>{max_total:.2f}</span></td></tr>
-                            <tr><td>📌 Performance</td><td>{perf}</td></tr>
-                        </tbody>
-                    </table>
-                """, unsafe_allow_html=True)
-
-        # ---------- Charts & Summary (CA version) ----------
-        st.markdown("---")
-        st.subheader("📊 Performance Overview")
-
-        performance_order = ["Dual Star", "Exam Booster", "CA Anchor", "Developing"]
-        df_sorted["PerformanceClean"] = df_sorted["Performance"]
-        perf_counts = df_sorted["PerformanceClean"].value_counts().reindex(performance_order, fill_value=0)
-
-        fig, axs = plt.subplots(2, 2, figsize=(16, 10))
-        fig.patch.set_facecolor('#000000')
-        fig.suptitle(f" Performance Overview - {module_name} ({module_code})", fontsize=18, weight='bold', color='white')
-
-        # Performance distribution
-        axs[0, 0].bar(performance_order, perf_counts.values, color=["gold", "limegreen", "orange", "red"])
-        axs[0, 0].set_title("Overall Performance", fontsize=14)
-        axs[0, 0].set_ylabel("No. of Students")
-        for i, val in enumerate(perf_counts.values):
-            axs[0, 0].text(i, val + 1, str(val), ha='center', fontsize=10, color='#e6edf3')
-        axs[0, 0].grid(axis="y", linestyle="--", alpha=0.2, color='white')
-
-        # Grade Distribution
-        custom_grade_order = ["A+", "A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D+", "D", "E", "F", "N/A"]
-        grade_counts = df_sorted["Grade"].value_counts().reindex(custom_grade_order, fill_value=0)
-        axs[0, 1].bar(grade_counts.index, grade_counts.values, color="coral")
-        axs[0, 1].set_title("Grade Distribution")
-        axs[0, 1].set_xlabel("Grades")
-        axs[0, 1].set_ylabel("Number of Students")
-        axs[0, 1].tick_params(axis='x', rotation=45)
-        axs[0, 1].grid(axis="y", linestyle="--", alpha=0.2, color='white')
-
-        # Status Breakdown
-        status_counts = df_sorted["Status"].value_counts()
-        colors = ["skyblue", "salmon", "orange"]
-        wedges, texts, autotexts = axs[1, 0].pie(
-            status_counts.values,
-            labels=status_counts.index,
-            autopct='%1.1f%%',
-            startangle=140,
-            colors=colors,
-            wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
-            textprops={'color': '#e6edf3'}
-        )
-        for t in autotexts:
-            t.set_color('#e6edf3')
-        axs[1, 0].set_title("Status Breakdown", fontsize=14)
-
-        # Final Grade Distribution (CA Scaled)
-        axs[1, 1].hist(df_sorted["CA_Scaled"], bins=10, color="mediumpurple", edgecolor="#e6edf3")
-        axs[1, 1].set_title("CA Distribution", fontsize=14)
-        axs[1, 1].set_xlabel("Final Grade")
-        axs[1, 1].set_ylabel("No. of Students")
-        axs[1, 1].grid(True, linestyle="--", alpha=0.2, color='white')
-
-        # Apply dark styling to all axes
-        for ax in axs.flatten():
-            ax.set_facecolor('#0d1117')
-            ax.title.set_color('white')
-            ax.xaxis.label.set_color('white')
-            ax.yaxis.label.set_color('white')
-            ax.tick_params(colors='#e6edf3')
-            for spine in ax.spines.values():
-                spine.set_color('#30363d')
-
-        fig.subplots_adjust(hspace=0.5)
-        st.pyplot(fig)
-
-        total_students = len(df_sorted)
-        class_avg = df_sorted["CA_Scaled"].mean()
-        num_pass = df_sorted[df_sorted["Status"] == "Pass"].shape[0]
-        num_fail = df_sorted[df_sorted["Status"] != "Pass"].shape[0]
-
-        st.markdown(f"""
-        ### 📋 Summary
-        - 👥 Total Students: <span style='color: green'>{total_students}</span>  
-        - 📚 Average CA: <span style='color: green'>{class_avg:.2f}</span> (Raw Avg: <span style='color: green'>{class_avg / ca_weight:.2f}%</span>)  
-        - ✅ Passed: <span style='color: green'>{num_pass}</span>  
-        - ❌ Not Passed: <span style='color: green'>{num_fail}</span>  
-        """, unsafe_allow_html=True)
-
-    # -------------------------------------------------------------
-    # Branch 2: PDFs WITHOUT CA marks (grade-only)
-    # -------------------------------------------------------------
-    else:
-        st.info("📊 This PDF does **not** contain CA marks. Analysis is based on final **grades only**.")
-
-        # Map grade to an approximate numeric score (midpoint of band) for charts/ranks
-        grade_mid = {g: (lo + hi) / 2 for g, (lo, hi) in grade_ranges.items()}
-        df["ScoreApprox"] = df["Grade"].map(grade_mid)
-        df["GradeOrder"] = df["Grade"].map(grade_order)
-        df["Performance"] = df["Grade"].map(grade_to_perf)
-
-        # Sort by grade order then RegNo
-        df_sorted = df.sort_values(by=["GradeOrder", "RegNo"]).reset_index(drop=True)
-        df_sorted["Rank"] = df_sorted.index + 1
-
-        # 🔍 Student search (grade-only)
-        reg_input = st.text_input("🔍 Enter Student ID Number", max_chars=20)
-
-        if reg_input:
-            cleaned = re.sub(r"[^A-Z0-9]", "", reg_input.upper())
-            matches_student = df_sorted[df_sorted["RegNo"].str.startswith(cleaned)]
-
-            if matches_student.empty:
-                st.warning("⚠ No matching registration found.")
-            elif len(matches_student) > 1:
-                st.info("Multiple matches found. Please enter full RegNo:")
-                st.markdown("Matching RegNos:")
-                for m in matches_student["RegNo"].tolist():
-                    st.markdown(f"- {m}")
-            else:
-                student = matches_student.iloc[0]
-                total = len(df_sorted)
-                rank = int(student["Rank"])
-                percentile = 100 * (rank / total)
-                grade = student["Grade"]
-                status = student["Status"]
-                perf = performance_emoji(student["Performance"])
-                min_total, max_total = grade_ranges.get(grade, (0, 0))
-                approx_score = student["ScoreApprox"]
-
-                st.markdown(f"""
-                    <h3>📊 Student Grade Report</h3>
-                    <table style="width: 100%; border-collapse: collapse;">
-                        <thead>
-                            <tr>
-                                <th style="text-align: left; padding: 8px;">Key</th>
-                                <th style="text-align: left; padding: 8px;">Value</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            <tr><td>🎓 RegNo</td><td>{student['RegNo']}</td></tr>
-                            <tr><td>🎯 Grade / 🧾 Status</td><td>{grade} &nbsp;|&nbsp; {status}</td></tr>
-                            <tr><td>📈 Estimated Total Marks</td><td><span style='color: green;'>{approx_score:.1f}</span> (from grade band)</td></tr>
-                            <tr><td>🎯 Grade Band Range</td><td><span style='color: green;'>{min_total:.1f}</span> - <span style='color: green;'>{max_total:.1f}</span></td></tr>
-                            <tr><td>🎓 Rank (by grade)</td><td><span style='color: green;'>{rank}</span> / {total}</td></tr>
-                            <tr><td>📊 Top Percentile</td><td>Top <span style='color: green;'>{percentile:.2f}%</span></td></tr>
-                            <tr><td>📌 Performance</td><td>{perf}</td></tr>
-                            <tr><td>ℹ️ Note</td><td>This module PDF does not show CA or exam breakdown — only final grades are available.</td></tr>
-                        </tbody>
-                    </table>
-                """, unsafe_allow_html=True)
-
-        # ---------- Charts & Summary (grade-only version) ----------
-        st.markdown("---")
-        st.subheader("📊 Performance Overview")
-
-        performance_order = ["Excellent", "High Performer", "Average", "Below Average"]
-        perf_counts = df_sorted["Performance"].value_counts().reindex(performance_order, fill_value=0)
-
-        fig, axs = plt.subplots(2, 2, figsize=(16, 10))
-        fig.patch.set_facecolor('#000000')
-        fig.suptitle(f" Performance Overview - {module_name} ({module_code})", fontsize=18, weight='bold', color='white')
-
-        # Performance distribution
-        axs[0, 0].bar(performance_order, perf_counts.values, color=["gold", "limegreen", "orange", "red"])
-        axs[0, 0].set_title("Performance Distribution", fontsize=14)
-        axs[0, 0].set_ylabel("No. of Students")
-        for i, val in enumerate(perf_counts.values):
-            axs[0, 0].text(i, val + 1, str(val), ha='center', fontsize=10, color='#e6edf3')
-        axs[0, 0].grid(axis="y", linestyle="--", alpha=0.2, color='white')
-
-        # Grade Distribution
-        custom_grade_order = ["A+", "A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D+", "D", "E", "F"]
-        grade_counts = df_sorted["Grade"].value_counts().reindex(custom_grade_order, fill_value=0)
-        axs[0, 1].bar(grade_counts.index, grade_counts.values, color="coral")
-        axs[0, 1].set_title("Grade Distribution")
-        axs[0, 1].set_xlabel("Grades")
-        axs[0, 1].set_ylabel("Number of Students")
-        axs[0, 1].tick_params(axis='x', rotation=45)
-        axs[0, 1].grid(axis="y", linestyle="--", alpha=0.2, color='white')
-
-        # Status Breakdown
-        status_counts = df_sorted["Status"].value_counts()
-        colors = ["skyblue", "salmon", "orange"]
-        wedges, texts, autotexts = axs[1, 0].pie(
-            status_counts.values,
-            labels=status_counts.index,
-            autopct='%1.1f%%',
-            startangle=140,
-            colors=colors,
-            wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
-            textprops={'color': '#e6edf3'}
-        )
-        for t in autotexts:
-            t.set_color('#e6edf3')
-        axs[1, 0].set_title("Status Breakdown", fontsize=14)
-
-        # Estimated final mark distribution from grade
-        axs[1, 1].hist(df_sorted["ScoreApprox"], bins=10, color="mediumpurple", edgecolor="#e6edf3")
-        axs[1, 1].set_title("Estimated Final Mark Distribution (from Grade)", fontsize=14)
-        axs[1, 1].set_xlabel("Estimated Total Mark")
-        axs[1, 1].set_ylabel("No. of Students")
-        axs[1, 1].grid(True, linestyle="--", alpha=0.2, color='white')
-
-        # Apply dark styling to all axes
-        for ax in axs.flatten():
-            ax.set_facecolor('#0d1117')
-            ax.title.set_color('white')
-            ax.xaxis.label.set_color('white')
-            ax.yaxis.label.set_color('white')
-            ax.tick_params(colors='#e6edf3')
-            for spine in ax.spines.values():
-                spine.set_color('#30363d')
-
-        fig.subplots_adjust(hspace=0.5)
-        st.pyplot(fig)
-
-        total_students = len(df_sorted)
-        class_avg = df_sorted["ScoreApprox"].mean()
-        num_pass = df_sorted[df_sorted["Status"] == "Pass"].shape[0]
-        num_fail = df_sorted[df_sorted["Status"] != "Pass"].shape[0]
-
-        st.markdown(f"""
-        ### 📋 Summary
-        - 👥 Total Students: <span style='color: green'>{total_students}</span>  
-        - 📚 Average Estimated Mark: <span style='color: green'>{class_avg:.2f}</span>  
-        - ✅ Passed: <span style='color: green'>{num_pass}</span>  
-        - ❌ Not Passed: <span style='color: green'>{num_fail}</span>  
-        """, unsafe_allow_html=True)
-
-    # -------------------------------------------------------------
-    # Footer - Creator info
-    # -------------------------------------------------------------
-    st.markdown("---")
-    st.markdown(
-        "<div style='text-align:center; color:#6c757d;'>Created by <b>Dilsha Prathibha</b></div>",
-        unsafe_allow_html=True
-    )
-    st.markdown("---")
+import streamlit as st
+import math
+import os
+import threading
+import logging
+
+from marks_analyzer import (
+    ParseCache,
+    analyze,
+    calibrate_backends,
+    content_hash,
+    find_students,
+    resolve_weights,
+    student_report,
+)
+from marks_analyzer.backends import REFERENCE_BACKEND, get_backend
+from marks_analyzer.extract import ExtractionTimeout
+from marks_analyzer.preflight import UploadLimits, UploadRejected, check_upload, parse_checked
+from marks_analyzer.cohort import cohort_table, combine_results, parse_uploads
+from marks_analyzer.charts import chart_key, render_overview
+from marks_analyzer.cube import module_summaries, stack_cells, summarize_cells
+from marks_analyzer.export import EXPORT_FORMATS, export_frame, table_bytes
+from marks_analyzer.overview import vega_lite_spec
+from marks_analyzer.pipeline import build_ca_pipeline, build_grade_pipeline, sheet_cells
+from marks_analyzer.schema import format_reg_no
+from marks_analyzer.store import ResultsStore
+from marks_analyzer.timing import StageTimer, save_profile, start_profiler
+from marks_analyzer.weights import DEFAULT_CA_WEIGHT_PERCENT
+
+# Page config
+st.set_page_config(page_title="📘 SLIIT Marks Analyzer", layout="wide")
+
+# 🔹 Apply outer frame and layout fix
+st.markdown("""
+    <style>
+        /* Limit max width & center all content */
+        .main {
+            padding-left: 300px !important;
+            padding-right: 300px !important;
+        }
+
+        /* Optional: Adjust spacing below inputs */
+        .element-container:has(.stTextInput) {
+            margin-bottom: 1.5rem;
+        }
+
+        /* Responsive breakpoints for smoother transitions */
+        
+        /* Large tablets and small desktops (1200px and below) */
+        @media (max-width: 1200px) {
+            .main {
+                padding-left: 200px !important;
+                padding-right: 200px !important;
+            }
+        }
+        
+        /* Medium tablets (992px and below) */
+        @media (max-width: 992px) {
+            .main {
+                padding-left: 100px !important;
+            padding-right: 100px !important;
+            }
+        }
+        
+        /* Small tablets (768px and below) */
+        @media (max-width: 768px) {
+            .main {
+                padding-left: 50px !important;
+                padding-right: 50px !important;
+            }
+        }
+        
+        /* Mobile devices (576px and below) */
+        @media (max-width: 576px) {
+            .main {
+                padding-left: 20px !important;
+                padding-right: 20px !important;
+            }
+        }
+    </style>
+""", unsafe_allow_html=True)
+
+
+# Worker processes for page extraction on large PDFs (1 = serial)
+EXTRACT_WORKERS = int(os.environ.get("SLIIT_EXTRACT_WORKERS", "1"))
+
+# Worker processes for parsing several uploaded PDFs at once (unset = one per CPU)
+UPLOAD_WORKERS = int(os.environ.get("SLIIT_UPLOAD_WORKERS", "0")) or None
+
+# PDF text extraction engine: a backend name, or "auto" to calibrate on the first upload
+PDF_BACKEND = os.environ.get("SLIIT_PDF_BACKEND", REFERENCE_BACKEND)
+
+
+def pdf_backend_error():
+    # A misspelt or uninstalled backend is reported up front, not on the first upload
+    if PDF_BACKEND == "auto":
+        return None
+    try:
+        get_backend(PDF_BACKEND)
+    except ValueError as exc:
+        return str(exc)
+    return None
+
+
+def env_number(name, convert=int):
+    value = os.environ.get(name)
+    return convert(value) if value else None
+
+
+def env_limit(name, default, convert=int):
+    # Unset keeps the default; 0 disables the limit
+    return convert(os.environ.get(name) or default) or None
+
+
+# Guards checked before a PDF is fully extracted
+max_upload_mb = env_limit("SLIIT_MAX_UPLOAD_MB", 50, float)
+UPLOAD_LIMITS = UploadLimits(
+    max_bytes=int(max_upload_mb * 2**20) if max_upload_mb else None,
+    max_pages=env_limit("SLIIT_MAX_PAGES", 1000),
+    max_seconds=env_limit("SLIIT_MAX_EXTRACT_SECONDS", 60, float),
+)
+
+
+@st.cache_resource
+def get_parse_cache():
+    # One cache for every session in the process, so a file uploaded by many
+    # students at once is parsed once; evicted entries spill to disk when a
+    # directory is configured
+    max_mb = env_number("SLIIT_CACHE_MAX_MB", float) or 512
+    return ParseCache(
+        max_entries=int(os.environ.get("SLIIT_CACHE_ENTRIES", "16")),
+        spill_dir=os.environ.get("SLIIT_CACHE_DIR") or None,
+        max_bytes=int(max_mb * 2**20),
+        ttl=env_number("SLIIT_CACHE_TTL", float),
+    )
+
+
+# Structured stage timings are logged to stderr as JSON lines
+analyzer_logger = logging.getLogger("marks_analyzer")
+if not analyzer_logger.handlers:
+    analyzer_logger.addHandler(logging.StreamHandler())
+    analyzer_logger.setLevel(os.environ.get("SLIIT_LOG_LEVEL", "INFO"))
+
+# Overview charts: "vega" draws them in the browser from precomputed counts;
+# "png" or "svg" rasterize them on the server with matplotlib
+CHART_FORMAT = os.environ.get("SLIIT_CHART_FORMAT", "vega")
+
+
+@st.cache_resource
+def get_chart_cache():
+    # Rendered overview images and export files, keyed by file hash and
+    # everything else they depend on
+    return ParseCache(max_entries=int(os.environ.get("SLIIT_CHART_CACHE_ENTRIES", "32")))
+
+
+@st.cache_resource
+def get_results_store():
+    # Opt-in: uploads are only persisted when a database path is configured
+    store_path = os.environ.get("SLIIT_STORE_PATH")
+    return ResultsStore(store_path) if store_path else None
+
+
+def store_upload(file_hash, parsed, name):
+    # Storing is a side effect of an upload; a store error must not fail it
+    results_store = get_results_store()
+    if results_store is None or parsed.df.empty:
+        return
+    try:
+        results_store.ingest(file_hash, parsed, source_name=name)
+    except Exception:
+        analyzer_logger.exception("Could not store %s in the results store", name)
+
+
+def show_student_history(reg_no):
+    results_store = get_results_store()
+    if results_store is None:
+        return
+
+    history = results_store.student_history(reg_no)
+    if history.empty:
+        return
+
+    st.markdown("#### 📚 Module History")
+    st.dataframe(history, hide_index=True)
+
+    overall = results_store.overall_rank(reg_no)
+    if overall and history.shape[0] > 1:
+        overall_rank, students, avg_total, modules = overall
+        st.markdown(
+            f"🏅 Overall rank across stored modules: <span style='color: green;'>{overall_rank}</span> / {students} "
+            f"(avg. estimated mark <span style='color: green;'>{avg_total:.1f}</span> over {modules} modules)",
+            unsafe_allow_html=True,
+        )
+
+
+@st.cache_resource
+def get_calibration_cache():
+    # Holds the calibrated backend for the whole process; single-flight, so
+    # concurrent first uploads calibrate only once
+    return ParseCache(max_entries=1)
+
+
+def calibrate_on(sample):
+    # Only calibrate on files that pass the upload guards, within their time limit
+    check_upload(sample, UPLOAD_LIMITS)
+    return calibrate_backends(sample, max_seconds=UPLOAD_LIMITS.max_seconds)
+
+
+def start_calibration(sample):
+    calibration_cache = get_calibration_cache()
+
+    def calibrate():
+        try:
+            # Single-flight: threads started by concurrent uploads wait for the first
+            calibration_cache.get_or_compute("calibration", lambda: calibrate_on(sample))
+        except Exception:
+            pass  # Nothing to calibrate on (rejected, unreadable or empty sample); try again next upload
+
+    threading.Thread(target=calibrate, name="pdf-backend-calibration", daemon=True).start()
+
+
+def pdf_backend_for(sample):
+    if PDF_BACKEND != "auto":
+        return PDF_BACKEND
+
+    calibration = get_calibration_cache().get("calibration")
+    if calibration is not None:
+        return calibration[0]
+
+    # Never calibrate on the request path: this upload uses the reference
+    # backend while a few of its pages are calibrated in the background
+    start_calibration(sample)
+    return REFERENCE_BACKEND
+
+
+def get_pipeline(name, build):
+    # One memoized pipeline per session and table format
+    if name not in st.session_state:
+        st.session_state[name] = build()
+    return st.session_state[name]
+
+
+def search_student(analysis, timer):
+    # Returns the report for a unique match; lists or warns otherwise
+    reg_input = st.text_input("🔍 Enter Student ID Number", max_chars=20)
+    if not reg_input:
+        return None
+
+    with timer.stage("lookup") as info:
+        positions = find_students(analysis, reg_input)
+        info["rows"] = len(positions)
+
+    if len(positions) == 0:
+        st.warning("⚠ No matching registration found.")
+    elif len(positions) > 1:
+        st.info("Multiple matches found. Please enter full RegNo:")
+        st.markdown("Matching RegNos:")
+        for m in analysis.ranked.df["RegNo"].iloc[positions].tolist():
+            st.markdown(f"- {format_reg_no(m)}")
+    else:
+        return student_report(analysis, positions[0])
+    return None
+
+
+def show_overview(overview, cache_key, module_code, module_name):
+    if CHART_FORMAT == "vega":
+        # Only the aggregates travel to the browser
+        st.vega_lite_chart(vega_lite_spec(overview, module_code, module_name))
+        return
+
+    image = get_chart_cache().get_or_compute(
+        chart_key(cache_key, "overview", CHART_FORMAT),
+        lambda: render_overview(overview, module_code, module_name, fmt=CHART_FORMAT),
+    )
+    if CHART_FORMAT == "svg":
+        st.image(image.decode("utf-8"))
+    else:
+        st.image(image)
+
+
+def show_footer():
+    # -------------------------------------------------------------
+    # Footer - Creator info
+    # -------------------------------------------------------------
+    st.markdown("---")
+    st.markdown(
+        "<div style='text-align:center; color:#6c757d;'>Created by <b>Dilsha Prathibha</b></div>",
+        unsafe_allow_html=True
+    )
+    st.markdown("---")
+
+
+SUMMARY_COLUMNS = {
+    "ModuleCode": "Module",
+    "total_students": "Students",
+    "num_pass": "Passed",
+    "num_fail": "Not Passed",
+    "avg_ca_percent": "Avg CA %",
+    "std_ca_percent": "CA Std Dev",
+    "avg_score": "Avg Est. Mark",
+}
+
+
+def show_cube_summary(label, summary):
+    # Grade-only modules have no CA marks to average
+    ca = "" if math.isnan(summary["avg_ca_percent"]) else (
+        f" · 📈 Avg CA: <span style='color: green'>{summary['avg_ca_percent']:.2f}%</span>"
+        f" (σ {summary['std_ca_percent']:.2f})"
+    )
+    st.markdown(
+        f"**{label}**: 👥 <span style='color: green'>{summary['total_students']}</span> results"
+        f" · ✅ Passed: <span style='color: green'>{summary['num_pass']}</span>"
+        f" · ❌ Not Passed: <span style='color: green'>{summary['num_fail']}</span>"
+        f" · 📚 Avg Estimated Mark: <span style='color: green'>{summary['avg_score']:.2f}</span>{ca}",
+        unsafe_allow_html=True,
+    )
+
+
+def show_cohort(uploaded_files):
+    # Several PDFs: parse them side by side and merge into one table per student
+    st.markdown(f"### 🧾 Cohort: {len(uploaded_files)} files")
+
+    uploads = [(f.name, f.getvalue()) for f in uploaded_files]
+    progress = st.progress(0.0, text=f"Parsing {len(uploads)} files...")
+    file_status = st.container()
+    results_store = get_results_store()
+
+    results = []
+    backend = pdf_backend_for(uploads[0][1])
+    parsed_uploads = parse_uploads(
+        uploads, cache=get_parse_cache(), workers=UPLOAD_WORKERS, backend=backend, limits=UPLOAD_LIMITS
+    )
+    for done, result in enumerate(parsed_uploads, start=1):
+        progress.progress(done / len(uploads), text=f"Parsed {done} of {len(uploads)} files")
+
+        parsed = result.parsed
+        if result.rejected:
+            file_status.error(f"❌ {result.name}: upload rejected, {result.error}.")
+            continue
+        if parsed is None:
+            file_status.error(f"❌ {result.name}: unable to read this PDF. Ensure it's a valid exam report.")
+            continue
+        if parsed.df.empty:
+            file_status.error(f"❌ {result.name}: no student data found. Is it a SLIIT Final Exam PDF?")
+            continue
+
+        file_status.markdown(
+            f"✅ **{result.name}**: {parsed.module_code} - {parsed.module_name}, "
+            f"{len(parsed.df)} students{' (cached)' if result.cached else ''}"
+        )
+        if not result.cached:
+            store_upload(result.file_hash, parsed, result.name)
+        results.append(result)
+
+    if not results:
+        st.stop()
+
+    # Merge in upload order so the first file wins when a module repeats
+    results.sort(key=lambda r: r.position)
+    cohort = cohort_table(combine_results((r.name, r.parsed) for r in results))
+
+    st.markdown("---")
+    st.subheader("👥 Combined Cohort")
+    st.caption(f"{len(cohort)} students across {len({r.parsed.module_code for r in results})} modules.")
+    st.dataframe(cohort, hide_index=True)
+    st.download_button(
+        "⬇️ Download cohort CSV",
+        cohort.to_csv(index=False).encode("utf-8"),
+        file_name="cohort.csv",
+        mime="text/csv",
+    )
+
+    # Summaries come from each file's aggregate cube cells, cached per file,
+    # so reruns and new uploads never rescan the student rows
+    chart_cache = get_chart_cache()
+    first_per_module = {}
+    for r in results:
+        first_per_module.setdefault(r.parsed.module_code, r)
+    cells = stack_cells(
+        chart_cache.get_or_compute(f"{r.file_hash}:cube", lambda r=r: sheet_cells(r.parsed))
+        for r in first_per_module.values()
+    )
+
+    st.subheader("📋 Module Summaries")
+    st.dataframe(module_summaries(cells).rename(columns=SUMMARY_COLUMNS), hide_index=True)
+    show_cube_summary("All uploaded modules", summarize_cells(cells))
+    if results_store is not None:
+        stored_modules = results_store.modules()
+        if len(stored_modules) > len(first_per_module):
+            show_cube_summary(f"All {len(stored_modules)} stored modules", results_store.summary())
+
+    show_footer()
+
+
+# cProfile the page when SLIIT_PROFILE_DIR is set. The profile is saved even
+# when the run is cut short by st.stop(), an error or a new interaction
+profiler = start_profiler()
+try:
+    with st.container():
+        st.title("📘 SLIIT Marks Analyzer")
+        st.markdown("Analyze student performance from exam PDFs with ranks, grades, and insights.")
+
+        backend_error = pdf_backend_error()
+        if backend_error:
+            st.error(f"❌ SLIIT_PDF_BACKEND: {backend_error}.")
+            st.stop()
+
+        uploaded_files = st.file_uploader(
+            "📂 Upload SLIIT Final Exam PDF Files", type=["pdf"], accept_multiple_files=True
+        ) or []
+
+    # One file gets the full report; several are merged into a cohort view
+    uploaded_file = uploaded_files[0] if len(uploaded_files) == 1 else None
+    if len(uploaded_files) > 1:
+        show_cohort(uploaded_files)
+
+    if uploaded_file:
+        # 🔹 Reuse the parsed result across reruns of the same file
+        timer = StageTimer(run_id=uploaded_file.name)
+
+        with timer.stage("hash"):
+            file_bytes = uploaded_file.getvalue()
+            file_hash = content_hash(file_bytes)
+        parse_cache = get_parse_cache()
+        chart_cache = get_chart_cache()
+
+        parsed_here = []
+
+        def parse_upload():
+            # Parse straight from the upload buffer; nothing is written to /tmp.
+            # The first pages are sniffed before anything else is extracted
+            parsed_here.append(True)
+            return parse_checked(
+                file_bytes, UPLOAD_LIMITS, workers=EXTRACT_WORKERS, timer=timer, backend=pdf_backend_for(file_bytes)
+            )
+
+        # Sessions uploading the same file at the same time wait for one parse
+        try:
+            parsed = parse_cache.get_or_compute(file_hash, parse_upload)
+        except (UploadRejected, ExtractionTimeout) as exc:
+            st.error(f"❌ Upload rejected: {exc}.")
+            st.stop()
+        except Exception:
+            st.error("❌ Unable to read the uploaded PDF. Ensure it's a valid exam report.")
+            st.stop()
+
+        # Stored outside the parse, so sessions waiting on it aren't held up
+        if parsed_here:
+            store_upload(file_hash, parsed, uploaded_file.name)
+
+        module_code = parsed.module_code
+        module_name = parsed.module_name
+        has_ca_marks = parsed.has_ca_marks
+
+        st.markdown(f"### 🧾 Module: {module_code} - {module_name}")
+
+        if parsed.df.empty:
+            st.error("❌ No student data found. Please make sure to upload valid *SLIIT Final Exam PDF* files only.")
+            st.stop()
+
+        # -------------------------------------------------------------
+        # Common grade meta
+        # -------------------------------------------------------------
+        def performance_emoji(perf):
+            return {
+                # old categories (grade-only branch)
+                "Excellent": "🌟 Excellent",
+                "High Performer": "✅ High Performer",
+                "Average": "🟡 Average",
+                "Below Average": "🔻 Below Average",
+                # new combined CA + Total categories
+                "Dual Star": "🌟 Dual Star (CA & Final Strong)",
+                "Exam Booster": "📘 Exam Booster (Final > CA)",
+                "CA Anchor": "🧩 CA Anchor (CA > Final)",
+                "Developing": "🔻 Developing (Needs Support)"
+            }.get(perf, perf)
+
+        # -------------------------------------------------------------
+        # Branch 1: PDFs WITH CA marks
+        # -------------------------------------------------------------
+        if has_ca_marks:
+            # Initialize session state for custom weight if not exists
+            if 'custom_ca_weight' not in st.session_state:
+                st.session_state.custom_ca_weight = DEFAULT_CA_WEIGHT_PERCENT
+
+            weights = resolve_weights(module_code)
+            if weights is not None:
+                weight_info = f"📊 **Weight Detected**: {int(weights.final_weight*100)}% Final + {int(weights.ca_weight*100)}% CA"
+            else:
+                st.warning(f"⚠️ Module {module_code} not recognized. Please set custom CA weight:")
+                custom_weight = st.number_input(
+                    "Enter CA Weight %", 
+                    min_value=0, 
+                    max_value=100, 
+                    value=st.session_state.custom_ca_weight,
+                    step=5,
+                    key="ca_weight_input"
+                )
+                st.session_state.custom_ca_weight = custom_weight
+                weights = resolve_weights(module_code, custom_weight)
+                weight_info = f"📊 **Custom Weight**: {int(weights.final_weight*100)}% Final + {int(weights.ca_weight*100)}% CA"
+            ca_weight, final_weight = weights.ca_weight, weights.final_weight
+        
+            st.info(weight_info)
+
+            # Classification, ranking and counts are reused across weight changes;
+            # only the weight-dependent stages (scaling, exam ranges, chart
+            # aggregates) re-run when the weight moves
+            pipeline = get_pipeline("ca_pipeline", build_ca_pipeline)
+            analysis = analyze(parsed, weights, pipeline=pipeline, key=file_hash, timer=timer)
+            summary, overview, exam_ranges = analysis.summary, analysis.overview, analysis.exam_ranges
+
+            # 🔍 Student search
+            report = search_student(analysis, timer)
+            if report:
+                reg_no = report.reg_no
+                perf = performance_emoji(report.performance)
+                st.markdown(f"""
+                    <h3>📊 Student Performance Report</h3>
+                    <table style="width: 100%; border-collapse: collapse;">
+                        <thead>
+                            <tr>
+                                <th style="text-align: left; padding: 8px;">Key</th>
+                                <th style="text-align: left; padding: 8px;">Value</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            <tr><td>🎓 RegNo</td><td>{reg_no}</td></tr>
+                            <tr><td>🎯 Grade / 🧾 Status</td><td>{report.grade} &nbsp;|&nbsp; {report.status}</td></tr>
+                            <tr><td>📈 CA Marks / 🎯 Scaled CA</td><td><span style='color: green;'>{report.ca_percent:.2f}%</span> &nbsp;|&nbsp; <span style='color: green;'>{report.ca_scaled:.1f}</span> / {int(ca_weight * 100)}</td></tr>
+                            <tr><td>🎓 Rank (Based on CA marks)</td><td><span style='color: green;'>{report.rank}</span> / {report.total}</td></tr>
+                            <tr><td>📊 Top Percentile (Based on CA)</td><td>Top <span style='color: green;'>{report.percentile:.2f}%</span></td></tr>
+                            <tr><td>🧪 Final Exam Marks</td><td>Between <span style='color: green;'>{report.exam_min:.1f}</span> - <span style='color: green;'>{report.exam_max:.1f}</span></td></tr>
+                            <tr><td>🎯 Total Marks</td><td>Between <span style='color: green;'>{report.min_total:.2f}</span> - <span style='color: green;'>{report.max_total:.2f}</span></td></tr>
+                            <tr><td>📌 Performance</td><td>{perf}</td></tr>
+                        </tbody>
+                    </table>
+                """, unsafe_allow_html=True)
+
+                show_student_history(reg_no)
+
+            # ---------- Charts & Summary (CA version) ----------
+            st.markdown("---")
+            st.subheader("📊 Performance Overview")
+
+            # Aggregated once per (file, weight) by the pipeline
+            with timer.stage("charts"):
+                show_overview(overview, f"{file_hash}:ca-{ca_weight}", module_code, module_name)
+
+            total_students = summary["total_students"]
+            raw_avg = summary["avg_ca_percent"]
+            class_avg = raw_avg * ca_weight
+            num_pass = summary["num_pass"]
+            num_fail = summary["num_fail"]
+
+            st.markdown(f"""
+            ### 📋 Summary
+            - 👥 Total Students: <span style='color: green'>{total_students}</span>  
+            - 📚 Average CA: <span style='color: green'>{class_avg:.2f}</span> (Raw Avg: <span style='color: green'>{raw_avg:.2f}%</span>)  
+            - ✅ Passed: <span style='color: green'>{num_pass}</span>  
+            - ❌ Not Passed: <span style='color: green'>{num_fail}</span>  
+            """, unsafe_allow_html=True)
+
+            # ---------- Final exam ranges for the whole class ----------
+            with st.expander("🧪 Final Exam Ranges (whole class)"):
+                st.caption(
+                    "Final exam marks each student needed for their grade, given their CA marks "
+                    f"and a {int(final_weight * 100)}% final exam weight."
+                )
+                st.dataframe(export_frame(exam_ranges), hide_index=True)
+
+                export_name = f"{module_code}_exam_ranges_ca{int(ca_weight * 100)}"
+                for fmt, mime in EXPORT_FORMATS.items():
+                    try:
+                        data = chart_cache.get_or_compute(
+                            chart_key(file_hash, f"exam-ranges-{ca_weight}", fmt),
+                            lambda: table_bytes(exam_ranges, fmt),
+                        )
+                    except ImportError:
+                        continue  # no Parquet engine installed
+                    st.download_button(
+                        f"⬇️ Download {fmt.upper()}",
+                        data,
+                        file_name=f"{export_name}.{fmt}",
+                        mime=mime,
+                        key=f"exam_ranges_{fmt}",
+                    )
+
+        # -------------------------------------------------------------
+        # Branch 2: PDFs WITHOUT CA marks (grade-only)
+        # -------------------------------------------------------------
+        else:
+            st.info("📊 This PDF does **not** contain CA marks. Analysis is based on final **grades only**.")
+
+            pipeline = get_pipeline("grade_pipeline", build_grade_pipeline)
+            analysis = analyze(parsed, pipeline=pipeline, key=file_hash, timer=timer)
+            summary, overview = analysis.summary, analysis.overview
+
+            # 🔍 Student search (grade-only)
+            report = search_student(analysis, timer)
+            if report:
+                reg_no = report.reg_no
+                perf = performance_emoji(report.performance)
+                st.markdown(f"""
+                    <h3>📊 Student Grade Report</h3>
+                    <table style="width: 100%; border-collapse: collapse;">
+                        <thead>
+                            <tr>
+                                <th style="text-align: left; padding: 8px;">Key</th>
+                                <th style="text-align: left; padding: 8px;">Value</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            <tr><td>🎓 RegNo</td><td>{reg_no}</td></tr>
+                            <tr><td>🎯 Grade / 🧾 Status</td><td>{report.grade} &nbsp;|&nbsp; {report.status}</td></tr>
+                            <tr><td>📈 Estimated Total Marks</td><td><span style='color: green;'>{report.approx_score:.1f}</span> (from grade band)</td></tr>
+                            <tr><td>🎯 Grade Band Range</td><td><span style='color: green;'>{report.min_total:.1f}</span> - <span style='color: green;'>{report.max_total:.1f}</span></td></tr>
+                            <tr><td>🎓 Rank (by grade)</td><td><span style='color: green;'>{report.rank}</span> / {report.total}</td></tr>
+                            <tr><td>📊 Top Percentile</td><td>Top <span style='color: green;'>{report.percentile:.2f}%</span></td></tr>
+                            <tr><td>📌 Performance</td><td>{perf}</td></tr>
+                            <tr><td>ℹ️ Note</td><td>This module PDF does not show CA or exam breakdown — only final grades are available.</td></tr>
+                        </tbody>
+                    </table>
+                """, unsafe_allow_html=True)
+
+                show_student_history(reg_no)
+
+            # ---------- Charts & Summary (grade-only version) ----------
+            st.markdown("---")
+            st.subheader("📊 Performance Overview")
+
+            with timer.stage("charts"):
+                show_overview(overview, f"{file_hash}:grades", module_code, module_name)
+
+            total_students = summary["total_students"]
+            class_avg = summary["avg_score"]
+            num_pass = summary["num_pass"]
+            num_fail = summary["num_fail"]
+
+            st.markdown(f"""
+            ### 📋 Summary
+            - 👥 Total Students: <span style='color: green'>{total_students}</span>  
+            - 📚 Average Estimated Mark: <span style='color: green'>{class_avg:.2f}</span>  
+            - ✅ Passed: <span style='color: green'>{num_pass}</span>  
+            - ❌ Not Passed: <span style='color: green'>{num_fail}</span>  
+            """, unsafe_allow_html=True)
+
+        # -------------------------------------------------------------
+        # Diagnostics - per-stage timings for this run
+        # -------------------------------------------------------------
+        timer.log()
+        with st.expander("🛠️ Diagnostics"):
+            st.caption(
+                f"Stages in this run took {timer.total_seconds * 1000:.1f} ms in total. "
+                f"Recomputed: {', '.join(pipeline.computed) or 'nothing (all stages memoized)'}."
+            )
+            st.dataframe(timer.as_frame(), hide_index=True)
+
+            cache_stats = parse_cache.stats()
+            st.caption(
+                f"Shared parse cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                f"{cache_stats['coalesced']} waited on an in-flight parse "
+                f"({cache_stats['hit_rate']:.0%} hit rate); {cache_stats['entries']} files, "
+                f"{cache_stats['bytes'] / 2**20:.1f} / {cache_stats['max_bytes'] / 2**20:.0f} MB, "
+                f"{cache_stats['evictions']} evicted, {cache_stats['expired']} expired."
+            )
+
+            calibration = get_calibration_cache().get("calibration") if PDF_BACKEND == "auto" else None
+            if calibration is None:
+                pending = " (calibrating in the background)" if PDF_BACKEND == "auto" else ""
+                st.caption(f"PDF backend: {PDF_BACKEND if PDF_BACKEND != 'auto' else REFERENCE_BACKEND}{pending}.")
+            else:
+                backend, trials = calibration
+                st.caption(f"PDF backend: {backend}, the fastest that matched {REFERENCE_BACKEND} on calibration.")
+                st.dataframe([trial._asdict() for trial in trials], hide_index=True)
+
+        show_footer()
+finally:
+    save_profile(profiler)
@@ -0,0 +1,68 @@
+"""Micro-benchmark: row-wise vs vectorized CA performance classification.
+
+Run from the repository root::
+
+    python benchmarks/bench_classify.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from marks_analyzer.classify import classify_ca_performance  # noqa: E402
+from marks_analyzer.grades import GRADE_MID, GRADE_ORDER  # noqa: E402
+
+SIZES = [1_000, 10_000, 100_000]
+
+
+def performance_category_combined(row):
+    # The original per-row classifier from app.py
+    ca = row["CAMarksPercent"]
+    approx_total = GRADE_MID.get(row["Grade"], ca)
+
+    if ca >= 70 and approx_total >= 70:
+        return "Dual Star"
+    elif ca < 70 and approx_total >= 70:
+        return "Exam Booster"
+    elif ca >= 70 and approx_total < 70:
+        return "CA Anchor"
+    else:
+        return "Developing"
+
+
+def make_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    grades = list(GRADE_ORDER) + ["N/A"]
+    return pd.DataFrame({
+        "CAMarksPercent": rng.uniform(0, 100, n).round(2),
+        "Grade": rng.choice(grades, n),
+    })
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    print(f"{'rows':>8}  {'apply (s)':>10}  {'vectorized (s)':>14}  {'speedup':>8}")
+    for n in SIZES:
+        df = make_frame(n)
+        t_apply, expected = best_of(lambda: df.apply(performance_category_combined, axis=1), 1 if n > 10_000 else 3)
+        t_vec, got = best_of(lambda: classify_ca_performance(df["CAMarksPercent"], df["Grade"]), 5)
+
+        assert list(expected) == list(got), "vectorized labels differ from row-wise labels"
+        print(f"{n:>8}  {t_apply:>10.4f}  {t_vec:>14.4f}  {t_apply / t_vec:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Memory held per 10k students: original object/float64 tables vs the compact schema.
+
+Run from the repository root::
+
+    python benchmarks/bench_memory.py [--students 10000]
+
+"Before" rebuilds the tables the app used to keep alive in a session
+(``df`` plus ``df_sorted`` with object-string labels, float64 marks and the
+duplicate ``PerformanceClean`` / ``FinalGrade`` columns). "After" is the
+cached parse result plus what the CA pipeline memoizes.
+"""
+
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import synthetic_rows  # noqa: E402
+from marks_analyzer.parser import parse_text  # noqa: E402
+from marks_analyzer.pipeline import build_ca_pipeline  # noqa: E402
+from marks_analyzer.schema import decode_reg_nos  # noqa: E402
+
+
+def frame_bytes(*objects):
+    # Series.memory_usage returns an int, DataFrame.memory_usage a per-column Series
+    return sum(int(pd.Series(obj.memory_usage(index=True, deep=True)).sum()) for obj in objects)
+
+
+def original_tables(parsed, ca_weight=0.4):
+    # The pre-compaction schema: every label an object string, marks float64
+    df = pd.DataFrame({
+        "RegNo": decode_reg_nos(parsed.df["RegNo"]),
+        "CAMarksPercent": parsed.df["CAMarksPercent"].astype("float64").round(2),
+        "Grade": parsed.df["Grade"].astype(object),
+        "Status": parsed.df["Status"].astype(object),
+    })
+    df["CA_Scaled"] = df["CAMarksPercent"] * ca_weight
+    df["FinalGrade"] = df["CA_Scaled"]
+    pipeline = build_ca_pipeline()
+    pipeline.set_input("parsed", parsed, key="original")
+    df["Performance"] = pipeline.get("classified")["Performance"].astype(object).to_numpy()
+
+    df_sorted = df.sort_values(by="CA_Scaled", ascending=False).reset_index(drop=True)
+    df_sorted["Rank"] = df_sorted.index + 1
+    df_sorted["PerformanceClean"] = df_sorted["Performance"]
+    return df, df_sorted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    text = "IT1010 - Introduction to Programming\n" + "\n".join(synthetic_rows(args.students)) + "\n"
+    parsed = parse_text(text)
+    assert len(parsed.df) == args.students
+
+    before = frame_bytes(*original_tables(parsed))
+
+    pipeline = build_ca_pipeline()
+    pipeline.set_input("parsed", parsed, key="compact")
+    pipeline.set_input("ca_weight", 0.4)
+    ranked, ca_scaled = pipeline.run("ranked", "scaled")
+    after = frame_bytes(parsed.df, ranked.df, ca_scaled)
+
+    per_10k = 10_000 / args.students
+    print(f"students: {args.students}")
+    print(f"before: {before / 2**20 * per_10k:8.2f} MB per 10k students")
+    print(f"after:  {after / 2**20 * per_10k:8.2f} MB per 10k students ({before / after:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""End-to-end benchmark of the analyzer pipeline on synthetic result PDFs.
+
+Each stage is timed on its own for both table layouts and a range of
+cohort sizes, and the results (seconds, throughput, peak traced memory)
+are written as JSON so runs can be compared across changes::
+
+    python benchmarks/run_benchmarks.py --sizes 50 500 5000 -o bench.json
+    python benchmarks/run_benchmarks.py --compare bench.json   # exit 1 on regressions
+
+Generated PDFs are kept in ``--data-dir`` and reused by later runs.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_result_pdf  # noqa: E402
+from marks_analyzer.charts import render_ca_overview, render_grade_overview  # noqa: E402
+from marks_analyzer.backends import BACKENDS, REFERENCE_BACKEND  # noqa: E402
+from marks_analyzer.extract import iter_page_texts  # noqa: E402
+from marks_analyzer.overview import ca_overview, grade_overview, vega_lite_spec  # noqa: E402
+from marks_analyzer.parser import ParsedResult, RecordParser, records_to_frame  # noqa: E402
+from marks_analyzer.pipeline import build_ca_pipeline, build_grade_pipeline  # noqa: E402
+from marks_analyzer.schema import decode_reg_nos  # noqa: E402
+from marks_analyzer.search import RegNoIndex  # noqa: E402
+
+DEFAULT_SIZES = [50, 500, 5000, 50000]
+LAYOUTS = ["ca", "grades"]
+LOOKUPS = 1000
+
+# A stage counts as regressed when it is this much slower than the baseline
+REGRESSION_RATIO = 1.25
+
+
+def dataset_path(data_dir, layout, students):
+    return os.path.join(data_dir, f"{layout}_{students}.pdf")
+
+
+def ensure_pdf(data_dir, layout, students):
+    path = dataset_path(data_dir, layout, students)
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        generate_result_pdf(path, students, with_ca=layout == "ca")
+    return path
+
+
+def rank_frame(parsed, ca_weight=0.4):
+    # Classification, ranking and scaling as the app's pipeline does it
+    if parsed.has_ca_marks:
+        pipeline = build_ca_pipeline()
+        pipeline.set_input("ca_weight", ca_weight)
+        stages = ("ranked", "scaled")
+    else:
+        pipeline = build_grade_pipeline()
+        stages = ("ranked",)
+    pipeline.set_input("parsed", parsed, key="bench")
+
+    ranked, *scaled = pipeline.run(*stages)
+    return ranked.df, (scaled[0] if scaled else None)
+
+
+def lookup_all(reg_codes, prefixes):
+    index = RegNoIndex(reg_codes)
+    return sum(len(index.lookup(p)) for p in prefixes)
+
+
+def measure(fn, repeat):
+    """Best wall time over ``repeat`` runs, then one traced run for peak memory."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, best, peak
+
+
+def bench_dataset(path, layout, students, repeat, backend=None):
+    """Return one result dict per pipeline stage for a single PDF."""
+    with open(path, "rb") as fh:
+        data = fh.read()
+
+    results = []
+
+    def record(stage, fn, units, unit_name="rows"):
+        result, seconds, peak = measure(fn, repeat)
+        results.append({
+            "layout": layout,
+            "students": students,
+            "stage": stage,
+            "seconds": seconds,
+            "throughput": units / seconds if seconds else None,
+            "throughput_unit": f"{unit_name}/s",
+            "peak_mb": peak / 2**20,
+        })
+        return result
+
+    pages = record("extract", lambda: list(iter_page_texts(data, backend=backend)), 1, "files")
+    page_count = len(pages)
+    results[-1]["throughput"] = page_count / results[-1]["seconds"]
+    results[-1]["throughput_unit"] = "pages/s"
+
+    def parse():
+        parser = RecordParser()
+        return list(parser.records(pages)), parser
+
+    rows, parser = record("parse", parse, students)
+    has_ca_marks = bool(parser.has_ca_marks)
+    assert len(rows) == students, f"parsed {len(rows)} of {students} rows from {path}"
+
+    df = record("dataframe", lambda: records_to_frame(rows, has_ca_marks), students)
+    parsed = ParsedResult("IT1010", "Introduction to Programming", has_ca_marks, df)
+    df_sorted, ca_scaled = record("classify_rank", lambda: rank_frame(parsed), students)
+
+    if has_ca_marks:
+        render = lambda: render_ca_overview(df_sorted, ca_scaled, parsed.module_code, parsed.module_name)  # noqa: E731
+    else:
+        render = lambda: render_grade_overview(df_sorted, parsed.module_code, parsed.module_name)  # noqa: E731
+    record("charts", render, students)
+
+    if has_ca_marks:
+        aggregate = lambda: ca_overview(df_sorted, ca_scaled)  # noqa: E731
+    else:
+        aggregate = lambda: grade_overview(df_sorted)  # noqa: E731
+    record("charts_vega", lambda: vega_lite_spec(aggregate(), parsed.module_code, parsed.module_name), students)
+
+    rng = np.random.default_rng(0)
+    reg_nos = decode_reg_nos(df["RegNo"])
+    prefixes = [reg_nos[i][: rng.integers(4, 11)] for i in rng.integers(0, len(reg_nos), LOOKUPS)]
+    record("lookup", lambda: lookup_all(df["RegNo"], prefixes), LOOKUPS, "lookups")
+
+    for result in results:
+        result["pages"] = page_count
+        result["pdf_bytes"] = len(data)
+    return results
+
+
+def compare(current, baseline_path):
+    """Print per-stage ratios against a previous run; returns the regressions."""
+    with open(baseline_path) as fh:
+        baseline = {
+            (r["layout"], r["students"], r["stage"]): r for r in json.load(fh)["results"]
+        }
+
+    regressions = []
+    print(f"\n{'layout':<7} {'students':>8} {'stage':<14} {'base (s)':>10} {'now (s)':>10} {'ratio':>7}")
+    for r in current:
+        base = baseline.get((r["layout"], r["students"], r["stage"]))
+        if base is None:
+            continue
+        ratio = r["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+        flag = "  <-- slower" if ratio > REGRESSION_RATIO else ""
+        print(f"{r['layout']:<7} {r['students']:>8} {r['stage']:<14} "
+              f"{base['seconds']:>10.4f} {r['seconds']:>10.4f} {ratio:>6.2f}x{flag}")
+        if flag:
+            regressions.append(r)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the SLIIT Marks Analyzer pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="cohort sizes to benchmark (default: %(default)s)")
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=LAYOUTS)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the best is kept")
+    parser.add_argument("--data-dir", default=os.path.join(os.path.dirname(__file__), "data"),
+                        help="where generated PDFs are cached")
+    parser.add_argument("-o", "--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="previous results JSON to compare against")
+    parser.add_argument("--backend", default=REFERENCE_BACKEND, choices=list(BACKENDS),
+                        help="PDF text extraction engine (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for layout in args.layouts:
+        for students in args.sizes:
+            path = ensure_pdf(args.data_dir, layout, students)
+            for r in bench_dataset(path, layout, students, args.repeat, args.backend):
+                results.append(r)
+                print(f"{layout:<7} {students:>8} {r['stage']:<14} {r['seconds']:>9.4f}s "
+                      f"{r['throughput']:>12.0f} {r['throughput_unit']:<10} {r['peak_mb']:>8.1f} MB peak")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "backend": args.backend,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nWrote {len(results)} measurements to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) slower than {REGRESSION_RATIO}x the baseline")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
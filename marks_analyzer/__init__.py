@@ -0,0 +1,38 @@
+"""Reusable parsing, caching and analysis helpers for the SLIIT Marks Analyzer."""
+
+from .analysis import Analysis, StudentReport, analyze, find_students, resolve_weights, student_report
+from .backends import available_backends
+from .cache import ParseCache, content_hash
+from .extract import extract_text, iter_page_texts
+from .parser import (
+    ParsedResult,
+    RecordParser,
+    StudentRecord,
+    calibrate_backends,
+    parse_pages,
+    parse_pdf,
+    parse_text,
+)
+from .search import RegNoIndex
+
+__all__ = [
+    "Analysis",
+    "ParseCache",
+    "ParsedResult",
+    "RecordParser",
+    "RegNoIndex",
+    "StudentRecord",
+    "StudentReport",
+    "analyze",
+    "available_backends",
+    "calibrate_backends",
+    "content_hash",
+    "extract_text",
+    "find_students",
+    "iter_page_texts",
+    "parse_pages",
+    "parse_pdf",
+    "parse_text",
+    "resolve_weights",
+    "student_report",
+]
@@ -0,0 +1,138 @@
+"""Plain-function analysis API, usable without Streamlit.
+
+    from marks_analyzer import analyze, find_students, parse_pdf, resolve_weights, student_report
+
+    parsed = parse_pdf("IT1010.pdf")
+    result = analyze(parsed, resolve_weights(parsed.module_code))
+    report = student_report(result, find_students(result, "IT2120")[0])
+
+:func:`analyze` runs the same memoized stages as the app. Pass the
+pipeline from a previous call (and a ``key`` identifying the file) to reuse
+classification and ranking when only the weight changes.
+"""
+
+import re
+from typing import NamedTuple, Optional
+
+from .grades import GRADE_RANGES
+from .pipeline import build_ca_pipeline, build_grade_pipeline
+from .schema import format_reg_no, marks_for_arithmetic
+from .weights import module_weights
+
+
+class Weights(NamedTuple):
+    ca_weight: float
+    final_weight: float
+    detected: bool  # from the known module tables rather than a custom CA %
+
+
+def resolve_weights(module_code, custom_ca_weight_percent=None):
+    """CA / final weights for ``module_code``.
+
+    Known modules use their fixed weighting; other modules use
+    ``custom_ca_weight_percent``, or return None when it is not given.
+    """
+    weights = module_weights(module_code)
+    if weights is not None:
+        return Weights(*weights, detected=True)
+
+    weights = module_weights(module_code, custom_ca_weight_percent)
+    return None if weights is None else Weights(*weights, detected=False)
+
+
+class Analysis(NamedTuple):
+    parsed: object
+    weights: Optional[Weights]  # None for grade-only sheets
+    ranked: object  # pipeline.Ranked: the ranked table and its RegNo lookup
+    summary: dict
+    overview: object  # overview.OverviewData for the charts
+    exam_ranges: object = None  # final-exam range per student; CA sheets only
+
+
+def analyze(parsed, weights=None, pipeline=None, key=None, timer=None):
+    """Classify, rank and summarize a :class:`~marks_analyzer.parser.ParsedResult`.
+
+    CA sheets need ``weights`` (see :func:`resolve_weights`); grade-only
+    sheets ignore them. ``pipeline`` must come from the matching
+    ``build_*_pipeline`` and ``key`` should identify the file, e.g. its
+    content hash.
+    """
+    key = id(parsed) if key is None else key
+
+    if parsed.has_ca_marks:
+        if weights is None:
+            raise ValueError(f"module {parsed.module_code} needs CA / final weights")
+        pipeline = pipeline or build_ca_pipeline()
+        pipeline.set_input("parsed", parsed, key=key)
+        pipeline.set_input("ca_weight", weights.ca_weight)
+        ranked, summary, overview, exam_ranges = pipeline.run(
+            "ranked", "summary", "overview", "exam_ranges", timer=timer
+        )
+        return Analysis(parsed, weights, ranked, summary, overview, exam_ranges)
+
+    pipeline = pipeline or build_grade_pipeline()
+    pipeline.set_input("parsed", parsed, key=key)
+    ranked, summary, overview = pipeline.run("ranked", "summary", "overview", timer=timer)
+    return Analysis(parsed, None, ranked, summary, overview)
+
+
+def clean_reg_query(text):
+    """Upper-case a search string and drop everything but letters and digits."""
+    return re.sub(r"[^A-Z0-9]", "", text.upper())
+
+
+def find_students(analysis, query):
+    """Positions in the ranked table of every RegNo starting with ``query``, in rank order."""
+    return analysis.ranked.regno_lookup.lookup(clean_reg_query(query))
+
+
+class StudentReport(NamedTuple):
+    reg_no: str
+    rank: int
+    total: int
+    percentile: float  # "Top X%"
+    grade: str
+    status: str
+    performance: str
+    min_total: float  # grade band
+    max_total: float
+    ca_percent: Optional[float] = None  # the rest are CA sheets only
+    ca_scaled: Optional[float] = None
+    exam_min: Optional[float] = None
+    exam_max: Optional[float] = None
+    approx_score: Optional[float] = None  # grade-only sheets: band midpoint
+
+
+def student_report(analysis, position):
+    """Everything the student report shows for the row at ``position`` in the ranked table."""
+    df = analysis.ranked.df
+    student = df.iloc[position]
+    rank = int(student["Rank"])
+    common = dict(
+        reg_no=format_reg_no(student["RegNo"]),
+        rank=rank,
+        total=len(df),
+        percentile=100 * (rank / len(df)),
+        grade=student["Grade"],
+        status=student["Status"],
+        performance=student["Performance"],
+    )
+
+    if analysis.exam_ranges is None:
+        min_total, max_total = GRADE_RANGES.get(student["Grade"], (0, 0))
+        return StudentReport(
+            **common, min_total=min_total, max_total=max_total, approx_score=student["ScoreApprox"],
+        )
+
+    # Precomputed for the whole class by the "exam_ranges" stage
+    exam_range = analysis.exam_ranges.iloc[position]
+    ca_percent = float(marks_for_arithmetic(student["CAMarksPercent"]))
+    return StudentReport(
+        **common,
+        min_total=exam_range["TotalMin"],
+        max_total=exam_range["TotalMax"],
+        ca_percent=ca_percent,
+        ca_scaled=ca_percent * analysis.weights.ca_weight,
+        exam_min=exam_range["ExamMin"],
+        exam_max=exam_range["ExamMax"],
+    )
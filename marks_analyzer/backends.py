@@ -0,0 +1,176 @@
+"""Interchangeable PDF text-extraction engines.
+
+PyPDF2 is the reference backend and always available. pypdfium2, pypdf and
+pdfminer.six are used when they happen to be installed; none of them is a
+requirement. Backends are looked up by name so worker processes can be
+told which one to use without pickling reader objects.
+
+Every backend opens a document once and then returns page texts by index.
+Their output is not guaranteed to match PyPDF2 character for character, so
+:func:`marks_analyzer.parser.calibrate_backends` checks that each one
+parses a sample into the same rows before it is used.
+"""
+
+import importlib.util
+import io
+import threading
+
+REFERENCE_BACKEND = "pypdf2"
+
+
+class ExtractionBackend:
+    """Base class: open a document, count its pages and extract one page's text."""
+
+    name = None
+    module = None  # import name; the backend is available when it is installed
+
+    @classmethod
+    def available(cls):
+        return importlib.util.find_spec(cls.module) is not None
+
+    def open(self, stream):
+        """Return a document handle for a seekable binary ``stream``."""
+        raise NotImplementedError
+
+    def page_count(self, document):
+        raise NotImplementedError
+
+    def page_text(self, document, index):
+        raise NotImplementedError
+
+    def close(self, document):
+        pass
+
+
+class PyPDF2Backend(ExtractionBackend):
+    name = "pypdf2"
+    module = "PyPDF2"
+
+    def open(self, stream):
+        from PyPDF2 import PdfReader
+        return PdfReader(stream)
+
+    def page_count(self, document):
+        return len(document.pages)
+
+    def page_text(self, document, index):
+        return document.pages[index].extract_text()
+
+
+class PypdfBackend(PyPDF2Backend):
+    # PyPDF2's successor; same reader API
+    name = "pypdf"
+    module = "pypdf"
+
+    def open(self, stream):
+        from pypdf import PdfReader
+        return PdfReader(stream)
+
+
+class _ReadIntoAdapter(io.RawIOBase):
+    # PDFium reads file-like objects through readinto(), which mmap lacks
+    def __init__(self, buffer):
+        self._buffer = buffer
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self._buffer.seek(offset, whence)
+        return self._buffer.tell()
+
+    def tell(self):
+        return self._buffer.tell()
+
+    def readinto(self, target):
+        data = self._buffer.read(len(target))
+        target[:len(data)] = data
+        return len(data)
+
+
+# PDFium is not thread-safe, even across separate documents; every call into
+# it from this process goes through one lock (worker processes each have their own)
+_PDFIUM_LOCK = threading.Lock()
+
+
+class PdfiumBackend(ExtractionBackend):
+    name = "pypdfium2"
+    module = "pypdfium2"
+
+    def open(self, stream):
+        import pypdfium2
+        if not hasattr(stream, "readinto"):
+            stream = _ReadIntoAdapter(stream)
+        with _PDFIUM_LOCK:
+            return pypdfium2.PdfDocument(stream)
+
+    def page_count(self, document):
+        with _PDFIUM_LOCK:
+            return len(document)
+
+    def page_text(self, document, index):
+        with _PDFIUM_LOCK:
+            page = document[index]
+            textpage = page.get_textpage()
+            try:
+                # PDFium ends lines with CRLF; the parser expects PyPDF2's "\n"
+                return textpage.get_text_range().replace("\r\n", "\n")
+            finally:
+                textpage.close()
+                page.close()
+
+    def close(self, document):
+        with _PDFIUM_LOCK:
+            document.close()
+
+
+class PdfminerBackend(ExtractionBackend):
+    name = "pdfminer"
+    module = "pdfminer"
+
+    def open(self, stream):
+        from pdfminer.pdfpage import PDFPage
+        return list(PDFPage.get_pages(stream))
+
+    def page_count(self, document):
+        return len(document)
+
+    def page_text(self, document, index):
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+
+        out = io.StringIO()
+        resources = PDFResourceManager()
+        device = TextConverter(resources, out, laparams=LAParams())
+        try:
+            PDFPageInterpreter(resources, device).process_page(document[index])
+        finally:
+            device.close()
+        return out.getvalue()
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (PyPDF2Backend(), PdfiumBackend(), PypdfBackend(), PdfminerBackend())
+}
+
+
+def available_backends():
+    """Names of the backends that can be used here, reference first."""
+    return [name for name, backend in BACKENDS.items() if backend.available()]
+
+
+def get_backend(name=None):
+    """The backend registered as ``name`` (default: the reference backend)."""
+    name = name or REFERENCE_BACKEND
+    try:
+        backend = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"unknown PDF backend {name!r}; choose from {', '.join(BACKENDS)}") from None
+    if not backend.available():
+        raise ValueError(f"PDF backend {name!r} is not installed")
+    return backend
@@ -0,0 +1,302 @@
+"""Content-addressed, thread-safe LRU cache for parsed PDFs and rendered charts."""
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("marks_analyzer.cache")
+
+
+def content_hash(data):
+    """SHA-256 hex digest of the uploaded file bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_content_hash(path, chunk_size=1 << 20):
+    """Same digest as :func:`content_hash`, read from disk in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _Flight:
+    """A computation in progress that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+def estimate_size(value):
+    """Rough in-memory size of a cached value in bytes."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(value)
+
+
+class ParseCache:
+    """Keeps the most recently used values (parse results, chart images) in memory.
+
+    One instance is shared by every session of the app, so all methods are
+    thread-safe. Entries are evicted least-recently-used first once there are
+    more than ``max_entries`` of them or their estimated size passes
+    ``max_bytes``; entries older than ``ttl`` seconds are dropped on lookup.
+
+    :meth:`get_or_compute` is single-flight: when several sessions ask for the
+    same missing key at once, one of them computes it and the rest wait for
+    that result instead of repeating the work.
+
+    When ``spill_dir`` is set, entries pushed out of memory are pickled there
+    and promoted back on the next lookup, so a large upload that fell out of
+    the in-memory window still skips re-extraction. The spill directory is
+    itself capped at ``max_disk_entries`` files. Spill files are written and
+    read with the lock released, and a failed spill is logged and the entry
+    dropped.
+    """
+
+    def __init__(self, max_entries=16, spill_dir=None, max_disk_entries=256, max_bytes=None, ttl=None):
+        self.max_entries = max_entries
+        self.spill_dir = spill_dir
+        self.max_disk_entries = max_disk_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, size, stored_at)
+        self._bytes = 0
+        self._inflight = {}
+        self._to_spill = OrderedDict()  # evicted, not yet written: key -> (value, stored_at)
+        self._lock = threading.RLock()
+        self._counters = dict.fromkeys(("hits", "misses", "coalesced", "evictions", "expired"), 0)
+
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._entries and not self._expired(self._entries[key][2]):
+                return True
+        return self.spill_dir is not None and os.path.exists(self._spill_path(key))
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def get(self, key):
+        with self._lock:
+            value = self._lookup(key)
+        if value is None:
+            value = self._promote_spilled(key)
+        with self._lock:
+            self._counters["misses" if value is None else "hits"] += 1
+        self._flush_spills()
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._store(key, value, time.monotonic())
+        self._flush_spills()
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, calling ``compute()`` at most once to fill it.
+
+        Concurrent callers for the same key block until the first one
+        finishes; if ``compute`` raises, every waiting caller sees the error.
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self._counters["hits"] += 1
+            else:
+                flight = self._inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._inflight[key] = _Flight()
+                else:
+                    self._counters["coalesced"] += 1
+
+        if value is not None:
+            # A pending spill taken back may have pushed another entry out
+            self._flush_spills()
+            return value
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            # Other callers for this key wait on the flight while the spill
+            # file is read
+            flight.value = self._promote_spilled(key)
+            with self._lock:
+                self._counters["misses" if flight.value is None else "hits"] += 1
+            if flight.value is None:
+                flight.value = compute()
+                self.put(key, flight.value)
+            else:
+                self._flush_spills()
+            return flight.value
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def stats(self):
+        """Hit/miss counters and current occupancy, for capacity planning."""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"] + self._counters["coalesced"]
+            return {
+                **self._counters,
+                "hit_rate": (lookups - self._counters["misses"]) / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "in_flight": len(self._inflight),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    # -------------------------------------------------------------
+    # Bookkeeping (callers hold the lock)
+    # -------------------------------------------------------------
+    def _expired(self, stored_at):
+        return self.ttl is not None and time.monotonic() - stored_at > self.ttl
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, size, stored_at = entry
+            if not self._expired(stored_at):
+                self._entries.move_to_end(key)
+                return value
+
+            # Stale entries are dropped, not spilled
+            del self._entries[key]
+            self._bytes -= size
+            self._counters["expired"] += 1
+            return None
+
+        # Evicted but not written out yet
+        pending = self._to_spill.pop(key, None)
+        if pending is None:
+            return None
+        value, stored_at = pending
+        self._store(key, value, stored_at)
+        return value
+
+    def _store(self, key, value, stored_at):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+
+        size = estimate_size(value)
+        self._entries[key] = (value, size, stored_at)
+        self._bytes += size
+
+        # Always keep the newest entry, even if it alone exceeds max_bytes
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            old_key, (old_value, old_size, old_stored_at) = self._entries.popitem(last=False)
+            self._bytes -= old_size
+            self._counters["evictions"] += 1
+            if self.spill_dir:
+                self._to_spill[old_key] = (old_value, old_stored_at)
+
+    # -------------------------------------------------------------
+    # Disk spill
+    # -------------------------------------------------------------
+    def _spill_path(self, key):
+        return os.path.join(self.spill_dir, f"{key}.pkl")
+
+    def _flush_spills(self):
+        # Write evicted entries to disk without holding the lock
+        while True:
+            with self._lock:
+                if not self._to_spill:
+                    return
+                key, (value, stored_at) = self._to_spill.popitem(last=False)
+            try:
+                self._spill(key, value, stored_at)
+            except Exception:
+                logger.warning("could not spill cache entry %s; dropping it", key, exc_info=True)
+
+    def _spill(self, key, value, stored_at):
+        path = self._spill_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as fh:
+                pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        # The file's mtime records when the value was first cached
+        stored_wall = time.time() - (time.monotonic() - stored_at)
+        os.utime(path, (stored_wall, stored_wall))
+        self._trim_spill_dir()
+
+    def _promote_spilled(self, key):
+        # Read a spill file back into memory; called without the lock
+        if not self.spill_dir:
+            return None
+
+        path = self._spill_path(key)
+        try:
+            age = time.time() - os.path.getmtime(path)
+            with open(path, "rb") as fh:
+                value = pickle.load(fh)
+            os.remove(path)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            # Missing, unreadable, or taken by another reader first
+            return None
+
+        stored_at = time.monotonic() - age
+        with self._lock:
+            if self._expired(stored_at):
+                self._counters["expired"] += 1
+                return None
+            if key in self._entries:
+                # Stored again while the file was being read; keep the newer value
+                return self._lookup(key)
+            self._store(key, value, stored_at)
+        return value
+
+    def _trim_spill_dir(self):
+        files = [
+            os.path.join(self.spill_dir, name)
+            for name in os.listdir(self.spill_dir)
+            if name.endswith(".pkl")
+        ]
+        if len(files) <= self.max_disk_entries:
+            return
+
+        files.sort(key=os.path.getmtime)
+        for path in files[: len(files) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,122 @@
+"""Rendering of the 2x2 "Performance Overview" figure to image bytes.
+
+This is the server-side fallback for the Vega-Lite charts in
+:mod:`marks_analyzer.overview`; both draw the same aggregates. matplotlib
+is only imported on the first render, so importing this module (and
+starting the app with Vega-Lite charts) does not pay for it.
+"""
+
+import io
+
+from .overview import (
+    GRADE_COLOR,
+    HIST_COLOR,
+    PERFORMANCE_COLORS,
+    STATUS_COLORS,
+    ca_overview,
+    grade_overview,
+)
+
+# Matches what st.pyplot used to produce
+SAVEFIG_OPTIONS = {"dpi": 200, "bbox_inches": "tight"}
+
+
+def chart_key(file_hash, variant, fmt):
+    """Cache key for one rendered overview; ``variant`` captures anything else it depends on."""
+    return f"{file_hash}:{variant}:{fmt}"
+
+
+def _draw_overview(axs, data):
+    # Performance distribution
+    perf_counts = data.performance
+    axs[0, 0].bar(list(perf_counts.index), perf_counts.values, color=PERFORMANCE_COLORS)
+    axs[0, 0].set_title(data.perf_title, fontsize=14)
+    axs[0, 0].set_ylabel("No. of Students")
+    for i, val in enumerate(perf_counts.values):
+        axs[0, 0].text(i, val + 1, str(val), ha='center', fontsize=10, color='#e6edf3')
+    axs[0, 0].grid(axis="y", linestyle="--", alpha=0.2, color='white')
+
+    # Grade Distribution
+    grade_counts = data.grades
+    axs[0, 1].bar(grade_counts.index, grade_counts.values, color=GRADE_COLOR)
+    axs[0, 1].set_title("Grade Distribution")
+    axs[0, 1].set_xlabel("Grades")
+    axs[0, 1].set_ylabel("Number of Students")
+    axs[0, 1].tick_params(axis='x', rotation=45)
+    axs[0, 1].grid(axis="y", linestyle="--", alpha=0.2, color='white')
+
+    # Status Breakdown
+    status_counts = data.status
+    wedges, texts, autotexts = axs[1, 0].pie(
+        status_counts.values,
+        labels=status_counts.index,
+        autopct='%1.1f%%',
+        startangle=140,
+        colors=STATUS_COLORS,
+        wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
+        textprops={'color': '#e6edf3'}
+    )
+    for t in autotexts:
+        t.set_color('#e6edf3')
+    axs[1, 0].set_title("Status Breakdown", fontsize=14)
+
+    # Mark distribution, from the precomputed bins
+    edges = data.hist_edges
+    axs[1, 1].hist(edges[:-1], bins=edges, weights=data.hist_counts, color=HIST_COLOR, edgecolor="#e6edf3")
+    axs[1, 1].set_title(data.hist_title, fontsize=14)
+    axs[1, 1].set_xlabel(data.hist_xlabel)
+    axs[1, 1].set_ylabel("No. of Students")
+    axs[1, 1].grid(True, linestyle="--", alpha=0.2, color='white')
+
+
+def _pyplot():
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def _render(draw, module_code, module_name, fmt):
+    plt = _pyplot()
+    fig, axs = plt.subplots(2, 2, figsize=(16, 10))
+    try:
+        fig.patch.set_facecolor('#000000')
+        fig.suptitle(f" Performance Overview - {module_name} ({module_code})", fontsize=18, weight='bold', color='white')
+
+        draw(axs)
+
+        # Apply dark styling to all axes
+        for ax in axs.flatten():
+            ax.set_facecolor('#0d1117')
+            ax.title.set_color('white')
+            ax.xaxis.label.set_color('white')
+            ax.yaxis.label.set_color('white')
+            ax.tick_params(colors='#e6edf3')
+            for spine in ax.spines.values():
+                spine.set_color('#30363d')
+
+        fig.subplots_adjust(hspace=0.5)
+
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt, **SAVEFIG_OPTIONS)
+        return buf.getvalue()
+    finally:
+        # Never leave figures in pyplot's registry between reruns
+        plt.close(fig)
+
+
+def render_overview(data, module_code, module_name, fmt="png"):
+    """Rasterize precomputed :class:`~marks_analyzer.overview.OverviewData` as ``fmt`` bytes."""
+    return _render(lambda axs: _draw_overview(axs, data), module_code, module_name, fmt)
+
+
+def render_ca_overview(df, ca_scaled, module_code, module_name, fmt="png"):
+    """Overview for PDFs with CA marks; ``df`` needs Performance, Grade and Status."""
+    return render_overview(ca_overview(df, ca_scaled), module_code, module_name, fmt)
+
+
+def render_grade_overview(df, module_code, module_name, fmt="png"):
+    """Overview for grade-only PDFs; ``df`` needs Performance, Grade, Status and ScoreApprox."""
+    return render_overview(grade_overview(df), module_code, module_name, fmt)
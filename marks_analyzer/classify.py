@@ -0,0 +1,90 @@
+"""Vectorized performance classification and grade-band arithmetic."""
+
+import numpy as np
+import pandas as pd
+
+from .grades import GRADE_MID, GRADE_ORDER, GRADE_RANGES, GRADE_TO_PERF, STRONG_MARK
+from .schema import CA_PERFORMANCE_DTYPE, GRADE_DTYPE, GRADE_PERFORMANCE_DTYPE, marks_for_arithmetic
+
+# Grade category codes index straight into these arrays
+_GRADE_MID_BY_CODE = np.array([GRADE_MID[g] for g in GRADE_DTYPE.categories], dtype=np.float64)
+_GRADE_MIN_BY_CODE = np.array([GRADE_RANGES[g][0] for g in GRADE_DTYPE.categories], dtype=np.float64)
+_GRADE_MAX_BY_CODE = np.array([GRADE_RANGES[g][1] for g in GRADE_DTYPE.categories], dtype=np.float64)
+_GRADE_ORDER_BY_CODE = np.array([GRADE_ORDER[g] for g in GRADE_DTYPE.categories], dtype=np.int64)
+_GRADE_PERF_CODE_BY_CODE = np.array(
+    [GRADE_PERFORMANCE_DTYPE.categories.get_loc(GRADE_TO_PERF[g]) for g in GRADE_DTYPE.categories],
+    dtype=np.int8,
+)
+
+
+def grade_codes(grades):
+    """Category codes of ``grades`` in ``GRADE_DTYPE`` (-1 for unknown grades)."""
+    return pd.Categorical(grades, dtype=GRADE_DTYPE).codes
+
+
+def grade_midpoints(grades, fallback=np.nan):
+    """Band midpoint per grade; unknown grades take ``fallback`` (scalar or array)."""
+    codes = grade_codes(grades)
+    return np.where(codes >= 0, _GRADE_MID_BY_CODE[codes], fallback)
+
+
+def grade_total_ranges(grades):
+    """``(min_total, max_total)`` arrays of each grade's band; unknown grades get ``(0, 0)``."""
+    codes = grade_codes(grades)
+    known = codes >= 0
+    return (
+        np.where(known, _GRADE_MIN_BY_CODE[codes], 0.0),
+        np.where(known, _GRADE_MAX_BY_CODE[codes], 0.0),
+    )
+
+
+def exam_mark_ranges(ca_percent, grades, ca_weight, final_weight):
+    """Final-exam mark range that, with each CA mark, lands in each grade's band.
+
+    The same back-calculation the student report does for one row, for
+    every row at once. ``exam_max`` is capped at 100; ``exam_min`` is left
+    as is (it can be negative when the CA alone already reaches the band).
+    Returns ``(exam_min, exam_max, min_total, max_total)`` float64 arrays.
+    """
+    ca_share = ca_weight * (marks_for_arithmetic(ca_percent) / 100)
+    min_total, max_total = grade_total_ranges(grades)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exam_min = ((min_total / 100) - ca_share) * 100 / final_weight
+        exam_max = ((max_total / 100) - ca_share) * 100 / final_weight
+
+    return exam_min, np.minimum(exam_max, 100), min_total, max_total
+
+
+def grade_order_values(grades):
+    """Rank order per grade (1 = A+); unknown grades are NaN."""
+    codes = grade_codes(grades)
+    return np.where(codes >= 0, _GRADE_ORDER_BY_CODE[codes], np.nan)
+
+
+def grade_performance(grades):
+    """Grade-only performance category per grade, as a categorical."""
+    codes = grade_codes(grades)
+    perf_codes = np.where(codes >= 0, _GRADE_PERF_CODE_BY_CODE[codes], -1)
+    return pd.Categorical.from_codes(perf_codes, dtype=GRADE_PERFORMANCE_DTYPE)
+
+
+def classify_ca_performance(ca_percent, grades):
+    """Label every row as Dual Star, Exam Booster, CA Anchor or Developing.
+
+    Uses the CA mark and the grade-band midpoint as an approximate total;
+    rows with an unrecognized grade fall back to the CA mark, as the
+    original per-row classifier did. Returns a categorical.
+    """
+    ca = marks_for_arithmetic(ca_percent)
+    approx_total = grade_midpoints(grades, fallback=ca)
+
+    ca_strong = ca >= STRONG_MARK
+    total_strong = approx_total >= STRONG_MARK
+
+    bucket = np.select(
+        [ca_strong & total_strong, total_strong, ca_strong],
+        [0, 1, 2],      # Dual Star, Exam Booster, CA Anchor
+        default=3,      # Developing
+    )
+    return pd.Categorical.from_codes(bucket, dtype=CA_PERFORMANCE_DTYPE)
@@ -0,0 +1,203 @@
+"""Headless batch conversion of SLIIT result PDFs.
+
+Usage::
+
+    python -m marks_analyzer results/ "archive/2024/*.pdf" -o marks.parquet
+
+Every PDF is parsed in a process pool with the same module detection, row
+patterns and weight tables as the Streamlit app. All student rows go into
+one Parquet or CSV dataset (chosen by the output extension) and a per-file
+summary with parse timings is written next to it.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from .backends import BACKENDS, REFERENCE_BACKEND, get_backend
+from .cache import file_content_hash
+from .parser import calibrate_backends, parse_pdf
+from .schema import decode_reg_nos, marks_for_arithmetic
+from .store import ResultsStore
+from .weights import DEFAULT_CA_WEIGHT_PERCENT, module_weights
+
+DATASET_COLUMNS = [
+    "SourceFile", "ModuleCode", "ModuleName", "RegNo", "CAMarksPercent",
+    "Grade", "Status", "CAWeight", "FinalWeight", "CA_Scaled",
+]
+
+
+def collect_pdfs(inputs):
+    """Expand directories and glob patterns into a sorted list of PDF paths.
+
+    Directories are searched recursively. Either way only files ending in
+    ``.pdf`` (in any case, so ``RESULTS.PDF`` too) are kept.
+    """
+    paths = set()
+    for item in inputs:
+        pattern = os.path.join(item, "**", "*") if os.path.isdir(item) else item
+        paths.update(
+            path for path in glob.glob(pattern, recursive=True)
+            if path.lower().endswith(".pdf") and os.path.isfile(path)
+        )
+    return sorted(paths)
+
+
+def process_file(path, default_ca_weight=DEFAULT_CA_WEIGHT_PERCENT, use_mmap=False, keep_parsed=False,
+                 backend=None):
+    """Parse one PDF; returns ``(rows DataFrame or None, summary dict, parsed or None)``.
+
+    The :class:`~marks_analyzer.parser.ParsedResult` is only returned with
+    ``keep_parsed``, for the caller to ingest. ``backend`` names the PDF
+    extraction engine.
+    """
+    summary = {
+        "SourceFile": path, "ModuleCode": None, "ModuleName": None,
+        "HasCAMarks": None, "Rows": 0, "CAWeight": None, "Seconds": 0.0, "Error": None,
+    }
+
+    start = time.perf_counter()
+    try:
+        parsed = parse_pdf(path, use_mmap=use_mmap, backend=backend)
+    except Exception as exc:
+        summary["Error"] = f"{type(exc).__name__}: {exc}"
+        summary["Seconds"] = time.perf_counter() - start
+        return None, summary, None
+
+    ca_weight, final_weight = module_weights(parsed.module_code, default_ca_weight)
+
+    df = parsed.df
+    if not parsed.has_ca_marks:
+        df = df.assign(CAMarksPercent=np.float32("nan"))
+    df = df.assign(
+        # Written as the two-decimal marks the PDF printed, not float32 noise
+        CAMarksPercent=marks_for_arithmetic(df["CAMarksPercent"]),
+        RegNo=decode_reg_nos(df["RegNo"]),
+        SourceFile=path,
+        ModuleCode=parsed.module_code,
+        ModuleName=parsed.module_name,
+        CAWeight=ca_weight,
+        FinalWeight=final_weight,
+    )
+    # Two-decimal marks times a whole-percent weight need at most four decimals
+    df["CA_Scaled"] = (df["CAMarksPercent"] * ca_weight).round(4)
+
+    summary.update(
+        ModuleCode=parsed.module_code,
+        ModuleName=parsed.module_name,
+        HasCAMarks=parsed.has_ca_marks,
+        Rows=len(df),
+        CAWeight=ca_weight,
+        Seconds=time.perf_counter() - start,
+    )
+    if df.empty:
+        summary["Error"] = "No student data found"
+        return None, summary, None
+
+    return df[DATASET_COLUMNS], summary, parsed if keep_parsed else None
+
+
+def write_table(df, path):
+    if path.lower().endswith(".csv"):
+        df.to_csv(path, index=False)
+    else:
+        df.to_parquet(path, index=False)
+
+
+def summary_path_for(output):
+    root, ext = os.path.splitext(output)
+    return f"{root}_summary{ext}"
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m marks_analyzer",
+        description="Convert a folder of SLIIT Final Exam PDFs into one Parquet/CSV dataset.",
+    )
+    arg_parser.add_argument("inputs", nargs="+", help="PDF files, directories or glob patterns")
+    arg_parser.add_argument("-o", "--output", default="marks.parquet",
+                            help="dataset path; a .csv extension writes CSV (default: marks.parquet)")
+    arg_parser.add_argument("--summary", help="per-file summary path (default: <output>_summary.<ext>)")
+    arg_parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                            help="worker processes (default: CPU count)")
+    arg_parser.add_argument("--default-ca-weight", type=float, default=DEFAULT_CA_WEIGHT_PERCENT,
+                            help="CA weight %% for modules without a known weighting (default: %(default)s)")
+    arg_parser.add_argument("--mmap", action="store_true",
+                            help="memory-map input files instead of reading them into memory")
+    arg_parser.add_argument("--store", metavar="DB",
+                            help="also ingest every parsed file into this SQLite results store")
+    arg_parser.add_argument("--backend", default=REFERENCE_BACKEND, choices=["auto", *BACKENDS],
+                            help="PDF text extraction engine; 'auto' picks the fastest installed one "
+                                 "that matches PyPDF2 on the first input (default: %(default)s)")
+    args = arg_parser.parse_args(argv)
+
+    pdfs = collect_pdfs(args.inputs)
+    if not pdfs:
+        print("No PDF files matched the given inputs.", file=sys.stderr)
+        return 1
+
+    backend = args.backend
+    if backend == "auto":
+        backend = REFERENCE_BACKEND
+        try:
+            backend, trials = calibrate_backends(pdfs[0])
+        except Exception as exc:
+            print(f"Calibration on {pdfs[0]} failed ({exc}); using {backend}", file=sys.stderr)
+        else:
+            for trial in trials:
+                outcome = trial.error or ("matches" if trial.matches else "different rows")
+                seconds = f"{trial.seconds:.3f}s" if trial.seconds is not None else "-"
+                print(f"  {trial.backend:<10} {seconds:>8}  {outcome}", file=sys.stderr)
+            print(f"Using PDF backend: {backend}", file=sys.stderr)
+    else:
+        try:
+            get_backend(backend)
+        except ValueError as exc:
+            print(exc, file=sys.stderr)
+            return 1
+
+    frames, summaries, parsed_by_path = [], [], {}
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = [pool.submit(process_file, path, args.default_ca_weight, args.mmap, bool(args.store), backend)
+                   for path in pdfs]
+        for done, future in enumerate(as_completed(futures), start=1):
+            df, summary, parsed = future.result()
+            summaries.append(summary)
+            if df is not None:
+                frames.append(df)
+            if parsed is not None:
+                parsed_by_path[summary["SourceFile"]] = parsed
+
+            status = summary["Error"] or f"{summary['Rows']} rows"
+            print(f"[{done}/{len(pdfs)}] {summary['SourceFile']}: {status} "
+                  f"({summary['Seconds']:.2f}s)", file=sys.stderr)
+
+    if args.store:
+        # Ingest in path order, not completion order: when several files
+        # carry the same module, the last path wins on every run
+        store = ResultsStore(args.store)
+        for path in pdfs:
+            if path in parsed_by_path:
+                store.ingest(file_content_hash(path), parsed_by_path[path], source_name=path)
+
+    dataset = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=DATASET_COLUMNS)
+    dataset = dataset.sort_values(["ModuleCode", "SourceFile", "RegNo"], kind="stable", ignore_index=True)
+    summary_df = pd.DataFrame(summaries).sort_values("SourceFile", ignore_index=True)
+
+    write_table(dataset, args.output)
+    write_table(summary_df, args.summary or summary_path_for(args.output))
+
+    failed = summary_df["Error"].notna().sum()
+    print(f"Wrote {len(dataset)} rows from {len(pdfs) - failed}/{len(pdfs)} files to {args.output}",
+          file=sys.stderr)
+    return 0 if failed == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
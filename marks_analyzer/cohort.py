@@ -0,0 +1,149 @@
+"""Parse several result PDFs at once and merge them into one cohort table.
+
+:func:`parse_uploads` parses a batch of uploads concurrently and yields
+each result as soon as it is ready, so a caller can report progress per
+file. :func:`combine_results` stacks the parsed sheets into one long table
+(one row per student per module), and :func:`cohort_table` pivots that into
+one row per RegNo with a column group per module. CA-mark and grade-only
+sheets can be mixed freely; grade-only modules simply have no CA column.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from .cache import content_hash
+from .extract import ExtractionTimeout
+from .parser import ParsedResult
+from .preflight import UploadLimits, UploadRejected, parse_checked
+from .schema import MARK_DTYPE, STATUS_DTYPE, decode_reg_nos, grade_categorical
+
+COHORT_COLUMNS = ["RegNo", "ModuleCode", "SourceFile", "CAMarksPercent", "Grade", "Status"]
+
+
+class UploadResult(NamedTuple):
+    position: int  # index of the file in the submitted batch
+    name: str
+    file_hash: str
+    parsed: Optional[ParsedResult]
+    error: Optional[str]
+    cached: bool
+    rejected: bool = False  # failed the upload guards rather than to parse
+
+
+def parse_uploads(uploads, cache=None, workers=None, backend=None, limits=UploadLimits()):
+    """Parse ``(name, bytes)`` pairs concurrently, yielding :class:`UploadResult` as each finishes.
+
+    Parsing runs in a process pool. With a :class:`~marks_analyzer.cache.ParseCache`
+    every file goes through ``cache.get_or_compute``, so files already parsed
+    (by this batch, another session or an earlier run) are not parsed again.
+    ``backend`` names the extraction engine, and every file is checked
+    against ``limits`` before it is fully extracted (see
+    :func:`~marks_analyzer.preflight.parse_checked`).
+
+    Closing the generator early (a Streamlit rerun does) cancels the files
+    not started yet and returns without waiting; parses already running
+    finish in the background and still fill the cache.
+    """
+    uploads = [(name, data, content_hash(data)) for name, data in uploads]
+    if not uploads:
+        return
+
+    workers = workers or min(len(uploads), os.cpu_count() or 1)
+    processes = ProcessPoolExecutor(max_workers=workers)
+    # Threads only wait on a process or on another session's parse of the
+    # same file; twice the process count keeps the pool busy
+    threads = ThreadPoolExecutor(max_workers=min(len(uploads), 2 * workers))
+
+    def job(position, name, data, file_hash):
+        computed = []
+
+        def compute():
+            computed.append(True)
+            return processes.submit(parse_checked, data, limits, backend=backend).result()
+
+        try:
+            if cache is None:
+                parsed = compute()
+            else:
+                parsed = cache.get_or_compute(file_hash, compute)
+        except (UploadRejected, ExtractionTimeout) as exc:
+            return UploadResult(position, name, file_hash, None, str(exc), False, rejected=True)
+        except Exception as exc:
+            return UploadResult(position, name, file_hash, None, f"{type(exc).__name__}: {exc}", False)
+        return UploadResult(position, name, file_hash, parsed, None, not computed)
+
+    futures = []
+    try:
+        futures = [threads.submit(job, i, *upload) for i, upload in enumerate(uploads)]
+        for future in as_completed(futures):
+            yield future.result()
+    except BaseException:
+        # Futures.cancel() rather than shutdown(cancel_futures=True), which needs Python 3.9
+        for future in futures:
+            future.cancel()
+        threads.shutdown(wait=False)
+        processes.shutdown(wait=False)
+        raise
+    threads.shutdown()
+    processes.shutdown()
+
+
+def combine_results(results):
+    """Stack ``(source_name, ParsedResult)`` pairs into one long cohort table.
+
+    ``RegNo`` stays as integer codes. Grade-only sheets get NaN CA marks.
+    """
+    frames = []
+    for source_name, parsed in results:
+        df = parsed.df
+        if parsed.has_ca_marks:
+            ca = df["CAMarksPercent"].to_numpy(dtype=MARK_DTYPE)
+        else:
+            ca = np.full(len(df), np.nan, dtype=MARK_DTYPE)
+        frames.append(pd.DataFrame({
+            "RegNo": df["RegNo"].to_numpy(),
+            "ModuleCode": parsed.module_code,
+            "SourceFile": source_name,
+            "CAMarksPercent": ca,
+            "Grade": df["Grade"].to_numpy(),
+            "Status": df["Status"].to_numpy(),
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=COHORT_COLUMNS)
+
+    long = pd.concat(frames, ignore_index=True)
+    long["ModuleCode"] = long["ModuleCode"].astype("category")
+    long["Grade"] = grade_categorical(long["Grade"])
+    long["Status"] = long["Status"].astype(STATUS_DTYPE)
+    return long
+
+
+def cohort_table(long):
+    """One row per RegNo, with CA %, grade and status columns per module.
+
+    If the same module appears in more than one file, the first file wins.
+    """
+    long = long.drop_duplicates(["RegNo", "ModuleCode"], keep="first")
+    modules = sorted(long["ModuleCode"].unique())
+
+    wide = long.pivot(index="RegNo", columns="ModuleCode", values=["CAMarksPercent", "Grade", "Status"])
+    columns = {}
+    for module in modules:
+        ca = wide[("CAMarksPercent", module)]
+        if ca.notna().any():
+            columns[f"{module} CA %"] = ca.astype(MARK_DTYPE)
+        columns[f"{module} Grade"] = wide[("Grade", module)]
+        columns[f"{module} Status"] = wide[("Status", module)]
+
+    table = pd.DataFrame(columns, index=wide.index)
+    table.insert(0, "Modules", long.groupby("RegNo").size().astype("int32"))
+    table.insert(1, "Passed", (long["Status"] == "Pass").groupby(long["RegNo"]).sum().astype("int32"))
+
+    table = table.sort_index()
+    table.index = pd.Index(decode_reg_nos(table.index), name="RegNo")
+    return table.reset_index()
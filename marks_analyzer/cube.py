@@ -0,0 +1,102 @@
+"""Aggregate cube of results: module x grade x status x performance.
+
+Each cell holds a student count and the count, sum and sum of squares of
+the CA marks in it. A sheet turns into a few dozen cells at most however
+many students it has, so summaries, averages and distributions over any
+set of modules are sums over those cells instead of scans over every
+student row. The cells of a sheet are built from its ranked table (see
+:func:`marks_analyzer.pipeline.sheet_cells`);
+:class:`~marks_analyzer.store.ResultsStore` keeps them for every stored
+module and swaps a module's cells when a newer sheet replaces it.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from .grades import GRADE_MID
+from .schema import marks_for_arithmetic
+
+CUBE_DIMENSIONS = ["ModuleCode", "Grade", "Status", "Performance"]
+CUBE_MEASURES = ["Students", "CAStudents", "CASum", "CASumSq"]
+CUBE_COLUMNS = CUBE_DIMENSIONS + CUBE_MEASURES
+
+
+def _labels(values):
+    # Plain strings for grouping and SQLite; missing labels become "N/A"
+    values = pd.Series(values).astype(object)
+    return values.where(values.notna(), "N/A").astype(str).to_numpy()
+
+
+def cube_cells(df, module_code, has_ca_marks):
+    """Cells for one module; ``df`` needs Grade, Status and Performance (and CAMarksPercent on CA sheets)."""
+    if has_ca_marks:
+        ca = marks_for_arithmetic(df["CAMarksPercent"])
+    else:
+        ca = np.full(len(df), np.nan)
+    has_ca = ~np.isnan(ca)
+    ca = np.where(has_ca, ca, 0.0)
+
+    frame = pd.DataFrame({
+        "Grade": _labels(df["Grade"]),
+        "Status": _labels(df["Status"]),
+        "Performance": _labels(df["Performance"]),
+        "Students": 1,
+        "CAStudents": has_ca.astype(np.int64),
+        "CASum": ca,
+        "CASumSq": ca * ca,
+    })
+    cells = frame.groupby(CUBE_DIMENSIONS[1:], sort=True).sum().reset_index()
+    cells.insert(0, "ModuleCode", module_code)
+    return cells[CUBE_COLUMNS]
+
+
+def stack_cells(cells):
+    """Concatenate the cells of several sheets into one cube."""
+    cells = list(cells)
+    if not cells:
+        return pd.DataFrame(columns=CUBE_COLUMNS)
+    return pd.concat(cells, ignore_index=True)
+
+
+def summarize_cells(cells):
+    """Summary counts and averages over ``cells``, as the per-file summary stages report them.
+
+    ``avg_ca_percent`` and ``std_ca_percent`` (population standard
+    deviation) cover students with CA marks; ``avg_score`` is the mean
+    grade-band midpoint of students with a recognized grade. Either is NaN
+    when no student qualifies.
+    """
+    students = int(cells["Students"].sum())
+    passed = int(cells.loc[cells["Status"] == "Pass", "Students"].sum())
+
+    ca_students = int(cells["CAStudents"].sum())
+    avg_ca = std_ca = math.nan
+    if ca_students:
+        avg_ca = float(cells["CASum"].sum()) / ca_students
+        variance = float(cells["CASumSq"].sum()) / ca_students - avg_ca * avg_ca
+        std_ca = math.sqrt(max(variance, 0.0))
+
+    midpoints = cells["Grade"].map(GRADE_MID)
+    graded = cells["Students"][midpoints.notna()]
+    avg_score = float((graded * midpoints.dropna()).sum() / graded.sum()) if graded.sum() else math.nan
+
+    return {
+        "total_students": students,
+        "num_pass": passed,
+        "num_fail": students - passed,
+        "avg_ca_percent": avg_ca,
+        "std_ca_percent": std_ca,
+        "avg_score": avg_score,
+    }
+
+
+def module_summaries(cells):
+    """One summary row per module in ``cells``."""
+    rows = [
+        {"ModuleCode": module, **summarize_cells(module_cells)}
+        for module, module_cells in cells.groupby("ModuleCode", sort=True)
+    ]
+    return pd.DataFrame(rows, columns=["ModuleCode", "total_students", "num_pass", "num_fail",
+                                       "avg_ca_percent", "std_ca_percent", "avg_score"])
@@ -0,0 +1,32 @@
+"""Student tables as downloadable CSV / Parquet bytes."""
+
+import io
+
+from .schema import decode_reg_nos
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def export_frame(df):
+    """Copy of ``df`` with RegNo codes turned back into RegNo strings."""
+    if "RegNo" in df and df["RegNo"].dtype.kind == "u":
+        df = df.assign(RegNo=decode_reg_nos(df["RegNo"]))
+    return df
+
+
+def table_bytes(df, fmt="csv"):
+    """Serialize ``df`` (RegNo decoded) as ``"csv"`` or ``"parquet"`` bytes.
+
+    Parquet needs pyarrow or fastparquet and raises ImportError without one.
+    """
+    df = export_frame(df)
+    if fmt == "csv":
+        return df.to_csv(index=False).encode("utf-8")
+    if fmt == "parquet":
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False)
+        return buffer.getvalue()
+    raise ValueError(f"unsupported export format: {fmt!r}")
@@ -0,0 +1,157 @@
+"""PDF text extraction, serial or fanned out over a process pool.
+
+The engine doing the work is one of the backends in
+:mod:`marks_analyzer.backends`, chosen by name (PyPDF2 by default).
+"""
+
+import io
+import math
+import mmap
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
+from contextlib import contextmanager
+
+from .backends import get_backend
+
+# PDFs with fewer pages than this are always extracted serially; below it the
+# cost of starting workers and re-opening the file outweighs the gain.
+PARALLEL_PAGE_THRESHOLD = 32
+
+
+class ExtractionTimeout(TimeoutError):
+    """Extraction ran past its ``max_seconds`` budget."""
+
+
+def _check_deadline(deadline, max_seconds):
+    if deadline is not None and time.monotonic() > deadline:
+        raise ExtractionTimeout(f"text extraction took longer than {max_seconds:g} seconds")
+
+
+@contextmanager
+def open_source(source, use_mmap=False):
+    """Yield a seekable binary stream over ``source`` without copying it to disk.
+
+    Paths are memory-mapped read-only when ``use_mmap`` is set, so very large
+    files are paged in by the OS instead of read into the heap, and opened
+    normally otherwise. In-memory bytes are wrapped in a ``BytesIO``; streams
+    are passed through unchanged.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fh:
+            if use_mmap:
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    yield mapped
+            else:
+                yield fh
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        # BytesIO over an immutable bytes object shares its buffer rather than copying
+        yield io.BytesIO(source)
+    else:
+        yield source
+
+
+@contextmanager
+def open_document(source, backend=None, use_mmap=False):
+    """Yield ``(backend, document)`` for ``source`` opened with the named backend."""
+    backend = get_backend(backend)
+    with open_source(source, use_mmap) as stream:
+        document = backend.open(stream)
+        try:
+            yield backend, document
+        finally:
+            backend.close(document)
+
+
+def _extract_page_range(source, start, stop, use_mmap=False, backend=None):
+    with open_document(source, backend, use_mmap) as (engine, document):
+        return [engine.page_text(document, i) for i in range(start, stop)]
+
+
+def _page_ranges(num_pages, workers):
+    # A couple of chunks per worker keeps the pool busy when pages vary in size
+    chunk = max(1, math.ceil(num_pages / (workers * 2)))
+    return [(start, min(start + chunk, num_pages)) for start in range(0, num_pages, chunk)]
+
+
+def iter_page_texts(source, workers=1, parallel_threshold=PARALLEL_PAGE_THRESHOLD, use_mmap=False,
+                    backend=None, max_seconds=None, max_pages=None):
+    """Yield the text of each page of ``source`` in order, newline-terminated.
+
+    ``source`` may be a path, a binary stream, or in-memory bytes / a
+    memoryview; nothing is written to disk. Paths can be memory-mapped with
+    ``use_mmap``. Empty pages are skipped. With ``workers`` greater than one
+    and at least ``parallel_threshold`` pages, page ranges are extracted in
+    a process pool; chunks are still yielded in page order as they complete.
+    ``backend`` names the extraction engine (default: PyPDF2). With
+    ``max_seconds``, :class:`ExtractionTimeout` is raised once that much
+    time has passed. Serially the deadline is checked between pages, so a
+    single very slow page can overrun it. In parallel the wait for each
+    chunk is bounded by the deadline, and on timeout the queued ranges are
+    cancelled and the worker processes terminated. ``max_pages`` stops
+    after that many pages.
+    """
+    deadline = time.monotonic() + max_seconds if max_seconds else None
+
+    with open_document(source, backend, use_mmap) as (engine, document):
+        num_pages = engine.page_count(document)
+        if max_pages is not None:
+            num_pages = min(num_pages, max_pages)
+
+        if workers <= 1 or num_pages < parallel_threshold:
+            for i in range(num_pages):
+                page_text = engine.page_text(document, i)
+                _check_deadline(deadline, max_seconds)
+                if page_text:
+                    yield page_text + "\n"
+            return
+
+    # Workers re-open the file themselves, so hand them a path or plain bytes
+    if isinstance(source, memoryview):
+        source = source.tobytes()
+    elif not isinstance(source, (str, os.PathLike, bytes, bytearray)):
+        source.seek(0)
+        source = source.read()
+
+    ranges = _page_ranges(num_pages, workers)
+    pool = ProcessPoolExecutor(max_workers=workers)
+    futures = []
+    try:
+        for start, stop in ranges:
+            futures.append(pool.submit(_extract_page_range, source, start, stop, use_mmap, engine.name))
+        for future in futures:
+            # Wait for each chunk only until the deadline, not until it is done
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                chunk = future.result(timeout=remaining)
+            except FuturesTimeout:
+                raise ExtractionTimeout(f"text extraction took longer than {max_seconds:g} seconds") from None
+            for page_text in chunk:
+                if page_text:
+                    yield page_text + "\n"
+    except BaseException:
+        # Timed out, failed or abandoned by the caller: drop the queued
+        # ranges and stop the workers instead of waiting for them
+        _abandon_pool(pool, futures)
+        raise
+    pool.shutdown()
+
+
+def _abandon_pool(pool, futures):
+    # Futures.cancel() rather than shutdown(cancel_futures=True), which needs Python 3.9
+    workers = list((getattr(pool, "_processes", None) or {}).values())
+    for future in futures:
+        future.cancel()
+    pool.shutdown(wait=False)
+    for process in workers:
+        if process.is_alive():
+            process.terminate()
+
+
+def extract_text(source, workers=1, parallel_threshold=PARALLEL_PAGE_THRESHOLD, use_mmap=False, backend=None):
+    """Return the text of every page of ``source`` as one string.
+
+    The parallel path gives output identical to the serial one.
+    """
+    return "".join(iter_page_texts(source, workers, parallel_threshold, use_mmap, backend))
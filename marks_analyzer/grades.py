@@ -0,0 +1,34 @@
+"""Grade bands and performance categories shared by the app and tools."""
+
+GRADE_RANGES = {
+    "A+": (90, 100), "A": (80, 89), "A-": (75, 79),
+    "B+": (70, 74), "B": (65, 69), "B-": (60, 64),
+    "C+": (55, 59), "C": (45, 54), "C-": (40, 44),
+    "D+": (35, 39), "D": (30, 34), "E": (0, 29),
+    "F": (0, 29)
+}
+
+GRADE_ORDER = {
+    "A+": 1, "A": 2, "A-": 3,
+    "B+": 4, "B": 5, "B-": 6,
+    "C+": 7, "C": 8, "C-": 9,
+    "D+": 10, "D": 11, "E": 12, "F": 13
+}
+
+# Approximate total mark for a grade: midpoint of its band
+GRADE_MID = {g: (lo + hi) / 2 for g, (lo, hi) in GRADE_RANGES.items()}
+
+GRADE_TO_PERF = {
+    "A+": "Excellent", "A": "Excellent", "A-": "Excellent",
+    "B+": "High Performer", "B": "High Performer",
+    "B-": "Average", "C+": "Average", "C": "Average",
+    "C-": "Below Average", "D+": "Below Average",
+    "D": "Below Average", "E": "Below Average", "F": "Below Average"
+}
+
+# Category orders used for charts (CA branch, grade-only branch)
+CA_PERFORMANCE_ORDER = ["Dual Star", "Exam Booster", "CA Anchor", "Developing"]
+GRADE_PERFORMANCE_ORDER = ["Excellent", "High Performer", "Average", "Below Average"]
+
+# CA and approximate total at or above this count as "strong"
+STRONG_MARK = 70
@@ -0,0 +1,158 @@
+"""Aggregates behind the "Performance Overview" charts, and a Vega-Lite spec for them.
+
+The overview only ever needs a handful of numbers: performance, grade and
+status counts plus a 10-bin histogram. :func:`ca_overview` and
+:func:`grade_overview` compute those once per dataset (the pipelines memoize
+them), and both renderers work from the result: :func:`vega_lite_spec` ships
+the small arrays to the browser, where Vega-Lite draws interactive charts,
+and :mod:`marks_analyzer.charts` still rasterizes the same figure with
+matplotlib. Nothing here imports matplotlib.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .grades import CA_PERFORMANCE_ORDER, GRADE_ORDER, GRADE_PERFORMANCE_ORDER
+
+GRADE_AXIS = list(GRADE_ORDER)
+HIST_BINS = 10
+
+PERFORMANCE_COLORS = ["gold", "limegreen", "orange", "red"]
+GRADE_COLOR = "coral"
+STATUS_COLORS = ["skyblue", "salmon", "orange"]
+HIST_COLOR = "mediumpurple"
+
+
+class OverviewData(NamedTuple):
+    performance: pd.Series  # count per category, in display order
+    grades: pd.Series  # count per grade on the grade axis
+    status: pd.Series  # count per status, zero counts dropped
+    hist_counts: np.ndarray
+    hist_edges: np.ndarray
+    perf_title: str
+    hist_title: str
+    hist_xlabel: str
+
+
+def overview_data(df, performance_order, perf_title, grade_axis, hist_values, hist_title, hist_xlabel):
+    status = df["Status"].value_counts()
+    hist_counts, hist_edges = np.histogram(np.asarray(hist_values), bins=HIST_BINS)
+    return OverviewData(
+        performance=df["Performance"].value_counts().reindex(performance_order, fill_value=0),
+        grades=df["Grade"].value_counts().reindex(grade_axis, fill_value=0),
+        status=status[status > 0],
+        hist_counts=hist_counts,
+        hist_edges=hist_edges,
+        perf_title=perf_title,
+        hist_title=hist_title,
+        hist_xlabel=hist_xlabel,
+    )
+
+
+def ca_overview(df, ca_scaled):
+    """Overview aggregates for PDFs with CA marks; ``df`` needs Performance, Grade and Status."""
+    return overview_data(
+        df, CA_PERFORMANCE_ORDER, "Overall Performance",
+        GRADE_AXIS + ["N/A"], ca_scaled, "CA Distribution", "Final Grade",
+    )
+
+
+def grade_overview(df):
+    """Overview aggregates for grade-only PDFs; ``df`` also needs ScoreApprox."""
+    return overview_data(
+        df, GRADE_PERFORMANCE_ORDER, "Performance Distribution",
+        GRADE_AXIS, df["ScoreApprox"].dropna(), "Estimated Final Mark Distribution (from Grade)",
+        "Estimated Total Mark",
+    )
+
+
+# -------------------------------------------------------------
+# Vega-Lite
+# -------------------------------------------------------------
+def _counts_values(counts, label):
+    return [{label: str(key), "Students": int(value)} for key, value in counts.items()]
+
+
+def _bar(title, counts, label, colors, x_title=None):
+    labels = [str(key) for key in counts.index]
+    return {
+        "title": title,
+        "width": 360,
+        "height": 220,
+        "data": {"values": _counts_values(counts, label)},
+        "mark": {"type": "bar", "tooltip": True},
+        "encoding": {
+            "x": {"field": label, "type": "nominal", "sort": labels, "title": x_title,
+                  "axis": {"labelAngle": -45 if len(labels) > 6 else 0}},
+            "y": {"field": "Students", "type": "quantitative", "title": "No. of Students"},
+            "color": {"field": label, "type": "nominal", "sort": labels, "legend": None,
+                      "scale": {"domain": labels, "range": colors}},
+        },
+    }
+
+
+def _status_pie(counts):
+    total = int(counts.sum()) or 1
+    values = [
+        {"Status": str(key), "Students": int(value), "Share": round(100 * int(value) / total, 1)}
+        for key, value in counts.items()
+    ]
+    return {
+        "title": "Status Breakdown",
+        "width": 220,
+        "height": 220,
+        "data": {"values": values},
+        "mark": {"type": "arc", "tooltip": True},
+        "encoding": {
+            "theta": {"field": "Students", "type": "quantitative"},
+            "color": {"field": "Status", "type": "nominal",
+                      "scale": {"domain": [v["Status"] for v in values], "range": STATUS_COLORS}},
+            "tooltip": [
+                {"field": "Status", "type": "nominal"},
+                {"field": "Students", "type": "quantitative"},
+                {"field": "Share", "type": "quantitative", "title": "Share (%)"},
+            ],
+        },
+    }
+
+
+def _histogram(data):
+    edges = data.hist_edges
+    values = [
+        {"start": float(edges[i]), "end": float(edges[i + 1]), "Students": int(count)}
+        for i, count in enumerate(data.hist_counts)
+    ]
+    return {
+        "title": data.hist_title,
+        "width": 360,
+        "height": 220,
+        "data": {"values": values},
+        "mark": {"type": "bar", "color": HIST_COLOR, "tooltip": True},
+        "encoding": {
+            "x": {"field": "start", "type": "quantitative", "bin": "binned", "title": data.hist_xlabel},
+            "x2": {"field": "end"},
+            "y": {"field": "Students", "type": "quantitative", "title": "No. of Students"},
+        },
+    }
+
+
+def vega_lite_spec(data, module_code, module_name):
+    """One Vega-Lite spec with the four overview charts in a 2x2 grid.
+
+    Only the aggregates in ``data`` are embedded, so the payload stays a
+    few kilobytes however many students the sheet has.
+    """
+    return {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "title": f"Performance Overview - {module_name} ({module_code})",
+        "vconcat": [
+            {"hconcat": [
+                _bar(data.perf_title, data.performance, "Performance", PERFORMANCE_COLORS),
+                _bar("Grade Distribution", data.grades, "Grade", [GRADE_COLOR] * len(data.grades), "Grades"),
+            ]},
+            {"hconcat": [_status_pie(data.status), _histogram(data)]},
+        ],
+        "resolve": {"scale": {"color": "independent"}},
+    }
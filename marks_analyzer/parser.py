@@ -0,0 +1,283 @@
+"""Record parsing for SLIIT Final Exam PDFs."""
+
+import re
+import time
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from .backends import REFERENCE_BACKEND, available_backends
+from .extract import iter_page_texts
+from .schema import MARK_DTYPE, REG_DTYPE, STATUS_DTYPE, encode_reg_no, grade_categorical
+from .search import RegNoIndex
+from .timing import NullTimer
+
+# 🔹 Module header like 'IT1010 - Introduction to Programming'
+MODULE_PATTERN = r"(IT\d{4})\s*-\s*([^\n\-]+)"
+
+# 🔹 Pattern 1: PDFs WITH CA marks (old behaviour)
+PATTERN_WITH_CA = (
+    r"\b\d+\s+"
+    r"(IT\s?\d{2}\s?\d{4}\s?\d{2})"     # RegNo like 'IT 23 8313 22'
+    r"\s+"
+    r"(\d{1,3}(?:\.\d{1,2})?)"          # CA mark column
+    r"\s+"
+    r"([A-Z\+\-]+)"                     # Grade
+    r"\s+"
+    r"(Pass|Fail|IC)"                   # Status
+)
+
+# 🔹 Pattern 2: PDFs WITHOUT CA marks
+PATTERN_NO_CA = (
+    r"\b\d+\s+"
+    r"(IT\s?\d{2}\s?\d{4}\s?\d{2})"  # RegNo only
+    r"\s+"
+    r"([A-Z\+\-]+)"                  # Grade
+    r"\s+"
+    r"(Pass|Fail|IC)"                # Status
+)
+
+
+# Precompiled once per process rather than on every rerun
+MODULE_RE = re.compile(MODULE_PATTERN)
+WITH_CA_RE = re.compile(PATTERN_WITH_CA)
+NO_CA_RE = re.compile(PATTERN_NO_CA)
+
+# Longest tail of unmatched text carried into the next page. A table row is
+# far shorter than this, so a row split across a page break is still found.
+MAX_CARRY = 256
+
+CA_COLUMNS = ["RegNo", "CAMarksPercent", "Grade", "Status"]
+NO_CA_COLUMNS = ["RegNo", "Grade", "Status"]
+
+
+class StudentRecord(NamedTuple):
+    """One parsed table row; ``ca_percent`` is None for grade-only PDFs."""
+
+    reg_no: str
+    ca_percent: Optional[float]
+    grade: str
+    status: str
+
+
+@dataclass
+class ParsedResult:
+    """Everything the app needs from one uploaded PDF.
+
+    ``df`` uses the compact schema from :mod:`marks_analyzer.schema`; in
+    particular ``RegNo`` holds integer codes, not strings.
+    """
+
+    module_code: str
+    module_name: str
+    has_ca_marks: bool
+    df: pd.DataFrame
+    regno_index: RegNoIndex = None
+
+    def __post_init__(self):
+        if self.regno_index is None:
+            self.regno_index = RegNoIndex(self.df["RegNo"])
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the table and its RegNo index."""
+        return int(self.df.memory_usage(index=True, deep=True).sum()) + self.regno_index.nbytes
+
+
+def _carry_tail(text):
+    if len(text) <= MAX_CARRY:
+        return text
+
+    # Cut on whitespace so the next page never starts mid-token
+    tail = text[-MAX_CARRY:]
+    for i, ch in enumerate(tail):
+        if ch.isspace():
+            return tail[i:]
+    return ""
+
+
+class RecordParser:
+    """Single-pass, page-at-a-time parser for result sheet text.
+
+    The table format is fixed by the first page that yields a row: CA rows
+    are tried first, then grade-only rows, exactly as the full-text scan
+    did. Only a short tail of each page is kept between calls, so memory
+    stays bounded however long the PDF is.
+    """
+
+    def __init__(self):
+        self.module_code = None
+        self.module_name = None
+        self.has_ca_marks = None
+        self._carry = ""
+
+    def feed(self, chunk):
+        """Yield the :class:`StudentRecord` rows completed by ``chunk``."""
+        text = self._carry + chunk
+
+        if self.module_code is None:
+            mod_match = MODULE_RE.search(text)
+            if mod_match:
+                self.module_code = mod_match.group(1).strip()
+                self.module_name = mod_match.group(2).strip()
+
+        if self.has_ca_marks is None:
+            candidates = [(True, WITH_CA_RE), (False, NO_CA_RE)]
+        elif self.has_ca_marks:
+            candidates = [(True, WITH_CA_RE)]
+        else:
+            candidates = [(False, NO_CA_RE)]
+
+        end = 0
+        for has_ca, pattern in candidates:
+            for match in pattern.finditer(text):
+                self.has_ca_marks = has_ca
+                end = match.end()
+                yield self._record(match, has_ca)
+
+            if self.has_ca_marks is not None:
+                break
+
+        self._carry = _carry_tail(text[end:])
+
+    def records(self, chunks):
+        """Yield records from an iterable of page texts."""
+        for chunk in chunks:
+            yield from self.feed(chunk)
+
+    @staticmethod
+    def _record(match, has_ca):
+        if has_ca:
+            reg_no, ca_percent, grade, status = match.groups()
+            ca_percent = float(ca_percent)
+        else:
+            reg_no, grade, status = match.groups()
+            ca_percent = None
+
+        return StudentRecord("".join(reg_no.upper().split()), ca_percent, grade, status)
+
+
+def records_to_frame(rows, has_ca_marks):
+    """Build the compact student DataFrame from parsed :class:`StudentRecord` rows.
+
+    See :mod:`marks_analyzer.schema` for the column types.
+    """
+    count = len(rows)
+    data = {"RegNo": np.fromiter((encode_reg_no(r.reg_no) for r in rows), dtype=REG_DTYPE, count=count)}
+
+    # 🔹 Build DataFrame depending on format
+    if has_ca_marks:
+        data["CAMarksPercent"] = np.fromiter((r.ca_percent for r in rows), dtype=MARK_DTYPE, count=count)
+
+    data["Grade"] = grade_categorical([r.grade for r in rows])
+    data["Status"] = pd.Categorical([r.status for r in rows], dtype=STATUS_DTYPE)
+
+    return pd.DataFrame(data, columns=CA_COLUMNS if has_ca_marks else NO_CA_COLUMNS)
+
+
+def parse_pages(chunks, timer=None):
+    """Parse an iterable of page texts into a :class:`ParsedResult`.
+
+    With a :class:`~marks_analyzer.timing.StageTimer`, time spent producing
+    pages is charged to "extract" and the regex pass to "parse".
+    """
+    timer = timer or NullTimer()
+    parser = RecordParser()
+
+    rows = []
+    for chunk in timer.timed_iter("extract", chunks):
+        with timer.stage("parse") as info:
+            before = len(rows)
+            rows.extend(parser.feed(chunk))
+            info["rows"] = len(rows) - before
+
+    has_ca_marks = bool(parser.has_ca_marks)
+    with timer.stage("dataframe", rows=len(rows)):
+        df = records_to_frame(rows, has_ca_marks)
+    with timer.stage("regno_index", rows=len(rows)):
+        regno_index = RegNoIndex(df["RegNo"])
+
+    return ParsedResult(
+        parser.module_code or "Unknown",
+        parser.module_name or "Unknown",
+        has_ca_marks,
+        df,
+        regno_index,
+    )
+
+
+def parse_text(text):
+    """Detect the module and table format in ``text`` and build the student DataFrame."""
+    return parse_pages([text])
+
+
+def parse_pdf(source, workers=1, use_mmap=False, timer=None, backend=None, max_seconds=None):
+    """Extract and parse a PDF path, stream or in-memory bytes; raises if the backend cannot read it.
+
+    ``backend`` names an extraction engine from :mod:`marks_analyzer.backends`
+    (default: PyPDF2). ``max_seconds`` caps extraction time (see
+    :func:`~marks_analyzer.extract.iter_page_texts`).
+    """
+    pages = iter_page_texts(source, workers=workers, use_mmap=use_mmap, backend=backend, max_seconds=max_seconds)
+    return parse_pages(pages, timer=timer)
+
+
+# Pages of the sample each backend extracts during calibration: enough rows
+# to compare, without parsing the whole upload once per backend
+CALIBRATION_PAGES = 3
+
+
+class BackendTrial(NamedTuple):
+    backend: str
+    seconds: Optional[float]  # best of the timed runs; None if the backend failed
+    matches: bool  # parsed exactly the same module and rows as PyPDF2
+    error: Optional[str] = None
+
+
+def _same_result(parsed, reference):
+    return (
+        parsed.module_code == reference.module_code
+        and parsed.module_name == reference.module_name
+        and parsed.has_ca_marks == reference.has_ca_marks
+        and parsed.df.equals(reference.df)
+    )
+
+
+def _parse_sample(sample, backend, pages, max_seconds):
+    return parse_pages(iter_page_texts(sample, backend=backend, max_seconds=max_seconds, max_pages=pages))
+
+
+def calibrate_backends(sample, backends=None, repeat=2, max_seconds=None, pages=CALIBRATION_PAGES):
+    """Pick the fastest extraction backend that parses ``sample`` exactly like PyPDF2.
+
+    ``sample`` is a path or PDF bytes; only its first ``pages`` pages are
+    used (None for all of them). Every installed backend (or those named in
+    ``backends``) parses them ``repeat`` times; backends that fail or
+    produce different rows are rejected. Returns ``(backend name, trials)``;
+    the name is PyPDF2's when nothing else qualifies. Raises ValueError if
+    those pages have no student rows to compare. ``max_seconds`` caps each
+    parse; a backend that runs over it counts as failed.
+    """
+    reference = _parse_sample(sample, REFERENCE_BACKEND, pages, max_seconds)
+    if reference.df.empty:
+        raise ValueError("calibration sample contains no student rows")
+
+    trials = []
+    for name in backends or available_backends():
+        best = None
+        try:
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                parsed = _parse_sample(sample, name, pages, max_seconds)
+                seconds = time.perf_counter() - start
+                best = seconds if best is None else min(best, seconds)
+        except Exception as exc:
+            trials.append(BackendTrial(name, None, False, f"{type(exc).__name__}: {exc}"))
+            continue
+        trials.append(BackendTrial(name, best, _same_result(parsed, reference)))
+
+    correct = [trial for trial in trials if trial.matches]
+    chosen = min(correct, key=lambda trial: trial.seconds).backend if correct else REFERENCE_BACKEND
+    return chosen, trials
@@ -0,0 +1,211 @@
+"""Staged analysis with per-stage memoization.
+
+Each :class:`Stage` declares the inputs it depends on. A stage is only
+recomputed when the key of one of its inputs changes, so moving the CA
+weight slider re-runs the weight-dependent scaling but reuses
+classification, ranking and summary counts for the same file. Summaries
+are read off the file's aggregate cube cells (see :mod:`marks_analyzer.cube`).
+"""
+
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Tuple
+
+import pandas as pd
+
+from .classify import (
+    classify_ca_performance,
+    exam_mark_ranges,
+    grade_midpoints,
+    grade_order_values,
+    grade_performance,
+)
+from .cube import cube_cells, summarize_cells
+from .overview import ca_overview, grade_overview
+from .schema import MARK_DTYPE, marks_for_arithmetic
+from .timing import NullTimer
+
+
+class Stage(NamedTuple):
+    name: str
+    fn: Callable
+    inputs: Tuple[str, ...]
+    # Intermediate stages that are only consumed by one memoized stage
+    # need not keep their own copy of the table alive
+    memoize: bool = True
+
+
+class Pipeline:
+    """A small dependency graph of memoized stages.
+
+    Raw inputs are set with :meth:`set_input`; a stage's memo key is built
+    from its inputs' keys, so any object (like a parsed DataFrame) can be an
+    input as long as it is given a cheap hashable key (like its file hash).
+    """
+
+    def __init__(self, stages, memo_size=2):
+        self.stages = {stage.name: stage for stage in stages}
+        self.memo_size = memo_size
+        self._memo = {name: OrderedDict() for name in self.stages}
+        self._inputs = {}
+        self.computed = []
+
+    def set_input(self, name, value, key=None):
+        self._inputs[name] = (value if key is None else key, value)
+
+    def key(self, name):
+        if name in self._inputs:
+            return self._inputs[name][0]
+        stage = self.stages[name]
+        return (name,) + tuple(self.key(dep) for dep in stage.inputs)
+
+    def get(self, name, timer=None):
+        """Value of ``name``, computing it and any stale dependencies first."""
+        if name in self._inputs:
+            return self._inputs[name][1]
+
+        stage = self.stages[name]
+        key = self.key(name)
+        memo = self._memo[name]
+        if key in memo:
+            memo.move_to_end(key)
+            return memo[key]
+
+        args = [self.get(dep, timer) for dep in stage.inputs]
+        with (timer or NullTimer()).stage(name):
+            value = stage.fn(*args)
+
+        if stage.memoize:
+            memo[key] = value
+            while len(memo) > self.memo_size:
+                memo.popitem(last=False)
+        self.computed.append(name)
+        return value
+
+    def run(self, *names, timer=None):
+        """Resolve several stages; ``computed`` lists what actually re-ran."""
+        self.computed = []
+        return [self.get(name, timer) for name in names]
+
+
+class Ranked(NamedTuple):
+    df: pd.DataFrame
+    regno_lookup: object
+
+
+def _rank(df, by, parsed, ascending):
+    # Stable sort keeps ties in PDF order, so ranks are deterministic
+    df_sorted = df.sort_values(by=by, ascending=ascending, kind="stable")
+    regno_lookup = parsed.regno_index.reorder(df_sorted.index)
+    df_sorted = df_sorted.reset_index(drop=True)
+    df_sorted["Rank"] = df_sorted.index + 1
+    return Ranked(df_sorted, regno_lookup)
+
+
+def ranked_cells(ranked, parsed):
+    # Every sheet's cube cells are built here: both pipelines, the store and
+    # the cohort view read the same classified, ranked table
+    return cube_cells(ranked.df, parsed.module_code, parsed.has_ca_marks)
+
+
+# -------------------------------------------------------------
+# PDFs WITH CA marks
+# -------------------------------------------------------------
+def classify_ca(parsed):
+    df = parsed.df.copy()
+    # 🔹 Performance uses BOTH CA and Total (from grade band midpoint)
+    df["Performance"] = classify_ca_performance(df["CAMarksPercent"], df["Grade"])
+    return df
+
+
+def rank_ca(classified, parsed):
+    # CA_Scaled is CA% times a non-negative weight, so ranking by the raw
+    # CA mark gives the same order without depending on the weight
+    return _rank(classified, "CAMarksPercent", parsed, ascending=False)
+
+
+def scale_ca(ranked, ca_weight):
+    # Only the scaled column, aligned with the ranked table, rather than a
+    # second copy of the whole table per weight
+    ca = marks_for_arithmetic(ranked.df["CAMarksPercent"])
+    return pd.Series(ca * ca_weight, name="CA_Scaled")
+
+
+def exam_ranges_ca(ranked, ca_weight):
+    # Final-exam range for every student in one pass, aligned with the
+    # ranked table; the final exam carries the rest of the weight
+    df = ranked.df
+    exam_min, exam_max, min_total, max_total = exam_mark_ranges(
+        df["CAMarksPercent"], df["Grade"], ca_weight, 1.0 - ca_weight
+    )
+    return pd.DataFrame({
+        "Rank": df["Rank"],
+        "RegNo": df["RegNo"],
+        "CAMarksPercent": marks_for_arithmetic(df["CAMarksPercent"]),
+        "Grade": df["Grade"],
+        "Status": df["Status"],
+        "TotalMin": min_total,
+        "TotalMax": max_total,
+        "ExamMin": exam_min,
+        "ExamMax": exam_max,
+    })
+
+
+def overview_ca(ranked, scaled):
+    return ca_overview(ranked.df, scaled)
+
+
+def build_ca_pipeline(memo_size=2):
+    """Inputs: ``parsed`` (keyed by file hash) and ``ca_weight``."""
+    return Pipeline([
+        Stage("classified", classify_ca, ("parsed",), memoize=False),
+        Stage("ranked", rank_ca, ("classified", "parsed")),
+        Stage("scaled", scale_ca, ("ranked", "ca_weight")),
+        Stage("exam_ranges", exam_ranges_ca, ("ranked", "ca_weight")),
+        Stage("overview", overview_ca, ("ranked", "scaled")),
+        Stage("cells", ranked_cells, ("ranked", "parsed")),
+        Stage("summary", summarize_cells, ("cells",)),
+    ], memo_size)
+
+
+# -------------------------------------------------------------
+# PDFs WITHOUT CA marks (grade-only)
+# -------------------------------------------------------------
+def classify_grades(parsed):
+    df = parsed.df.copy()
+    # Map grade to an approximate numeric score (midpoint of band) for charts/ranks
+    df["ScoreApprox"] = grade_midpoints(df["Grade"]).astype(MARK_DTYPE)
+    df["GradeOrder"] = grade_order_values(df["Grade"]).astype(MARK_DTYPE)
+    df["Performance"] = grade_performance(df["Grade"])
+    return df
+
+
+def rank_grades(classified, parsed):
+    # Sort by grade order then RegNo
+    return _rank(classified, ["GradeOrder", "RegNo"], parsed, ascending=True)
+
+
+def overview_grades(ranked):
+    return grade_overview(ranked.df)
+
+
+def build_grade_pipeline(memo_size=2):
+    """Input: ``parsed`` (keyed by file hash)."""
+    return Pipeline([
+        Stage("classified", classify_grades, ("parsed",), memoize=False),
+        Stage("ranked", rank_grades, ("classified", "parsed")),
+        Stage("cells", ranked_cells, ("ranked", "parsed")),
+        Stage("summary", summarize_cells, ("cells",)),
+        Stage("overview", overview_grades, ("ranked",)),
+    ], memo_size)
+
+
+def ranked_table(parsed):
+    """The ranked table the app shows for ``parsed``, without building a pipeline."""
+    if parsed.has_ca_marks:
+        return rank_ca(classify_ca(parsed), parsed)
+    return rank_grades(classify_grades(parsed), parsed)
+
+
+def sheet_cells(parsed):
+    """The cube cells of ``parsed``, without building a pipeline."""
+    return ranked_cells(ranked_table(parsed), parsed)
@@ -0,0 +1,103 @@
+"""Cheap checks that run before a PDF is fully extracted.
+
+:func:`check_upload` rejects files that are too large, have too many pages
+or do not look like an SLIIT result sheet. It reads only the first
+:data:`SNIFF_PAGES` pages, so an unrelated 500-page PDF is turned away in
+about the time it takes to open it. :func:`parse_checked` runs those checks
+and then the full parse under the same time budget.
+"""
+
+import os
+import time
+from typing import NamedTuple, Optional
+
+from .extract import ExtractionTimeout, open_document
+from .parser import RecordParser, parse_pdf
+from .timing import NullTimer
+
+# Pages read when sniffing; the header and first rows are on page one,
+# the second page covers sheets with a cover page
+SNIFF_PAGES = 2
+
+
+class UploadRejected(ValueError):
+    """The upload breaks a limit or is not an SLIIT result sheet."""
+
+
+class UploadLimits(NamedTuple):
+    """Per-upload caps; None means unlimited."""
+
+    max_bytes: Optional[int] = None
+    max_pages: Optional[int] = None
+    max_seconds: Optional[float] = None
+
+
+class SniffResult(NamedTuple):
+    module_code: Optional[str]
+    module_name: Optional[str]
+    has_ca_marks: bool
+    page_count: int
+
+
+def source_size(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    if isinstance(source, memoryview):
+        return source.nbytes
+    return len(source)
+
+
+def sniff(source, backend=None, pages=SNIFF_PAGES, use_mmap=False):
+    """Detect the module header and table format from the first ``pages`` pages.
+
+    Raises :class:`UploadRejected` when none of them contains a student row
+    in either table format.
+    """
+    parser = RecordParser()
+    with open_document(source, backend, use_mmap) as (engine, document):
+        page_count = engine.page_count(document)
+        for i in range(min(pages, page_count)):
+            # The first row is enough to fix the table format
+            next(parser.feed((engine.page_text(document, i) or "") + "\n"), None)
+            if parser.has_ca_marks is not None:
+                break
+
+    if parser.has_ca_marks is None:
+        raise UploadRejected("no SLIIT result table found on the first pages")
+    return SniffResult(parser.module_code, parser.module_name, parser.has_ca_marks, page_count)
+
+
+def check_upload(source, limits=UploadLimits(), backend=None, use_mmap=False):
+    """Enforce ``limits`` on size and page count, then :func:`sniff` the file."""
+    if limits.max_bytes is not None:
+        size = source_size(source)
+        if size > limits.max_bytes:
+            raise UploadRejected(
+                f"file is {size / 2**20:.1f} MB; the limit is {limits.max_bytes / 2**20:.1f} MB"
+            )
+
+    sniffed = sniff(source, backend=backend, use_mmap=use_mmap)
+    if limits.max_pages is not None and sniffed.page_count > limits.max_pages:
+        raise UploadRejected(f"file has {sniffed.page_count} pages; the limit is {limits.max_pages}")
+    return sniffed
+
+
+def parse_checked(source, limits=UploadLimits(), workers=1, use_mmap=False, timer=None, backend=None):
+    """:func:`check_upload`, then :func:`parse_pdf` within what is left of ``limits.max_seconds``.
+
+    Raises :class:`UploadRejected` or
+    :class:`~marks_analyzer.extract.ExtractionTimeout`.
+    """
+    start = time.monotonic()
+    with (timer or NullTimer()).stage("preflight"):
+        check_upload(source, limits, backend=backend, use_mmap=use_mmap)
+
+    max_seconds = None
+    if limits.max_seconds is not None:
+        max_seconds = max(limits.max_seconds - (time.monotonic() - start), 1e-3)
+    try:
+        return parse_pdf(source, workers=workers, use_mmap=use_mmap, timer=timer, backend=backend,
+                         max_seconds=max_seconds)
+    except ExtractionTimeout:
+        # Report the configured limit, not the remainder left after the checks
+        raise ExtractionTimeout(f"text extraction took longer than {limits.max_seconds:g} seconds") from None
@@ -0,0 +1,82 @@
+"""Compact column types for student tables.
+
+Label columns are categoricals over fixed category sets, marks are
+float32 and the RegNo is stored as its 8-digit number (``IT23831322`` ->
+``23831322``, uint32), which sorts exactly like the string. Use
+:func:`format_reg_no` / :func:`decode_reg_nos` to turn codes back into
+RegNo strings for display or export.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .grades import CA_PERFORMANCE_ORDER, GRADE_ORDER, GRADE_PERFORMANCE_ORDER
+
+REG_PREFIX = "IT"
+REG_DIGITS = 8
+
+MARK_DTYPE = np.float32
+MARK_DECIMALS = 2  # PDFs print marks with at most two decimals
+REG_DTYPE = np.uint32
+
+STATUSES = ["Pass", "Fail", "IC"]
+
+GRADE_DTYPE = pd.CategoricalDtype(list(GRADE_ORDER), ordered=True)
+STATUS_DTYPE = pd.CategoricalDtype(STATUSES)
+CA_PERFORMANCE_DTYPE = pd.CategoricalDtype(CA_PERFORMANCE_ORDER, ordered=True)
+GRADE_PERFORMANCE_DTYPE = pd.CategoricalDtype(GRADE_PERFORMANCE_ORDER, ordered=True)
+
+
+def marks_for_arithmetic(marks):
+    """float32 marks as float64, rounded back to the decimals the PDF printed.
+
+    float32 only approximates the printed value (49.54 is stored as
+    49.5400009...), and that error can flip a rounded figure derived from
+    it. Scale, average or back-calculate from these values instead.
+    """
+    return np.round(np.asarray(marks, dtype=np.float64), MARK_DECIMALS)
+
+
+def encode_reg_no(reg_no):
+    """``'IT23831322'`` -> ``23831322``; expects a cleaned RegNo."""
+    return int(reg_no[len(REG_PREFIX):])
+
+
+def format_reg_no(code):
+    return f"{REG_PREFIX}{int(code):0{REG_DIGITS}d}"
+
+
+def decode_reg_nos(codes):
+    """RegNo strings for an array of codes."""
+    return [format_reg_no(code) for code in codes]
+
+
+def reg_no_code_range(prefix):
+    """Half-open code range ``[lo, hi)`` of RegNos starting with ``prefix``.
+
+    ``prefix`` is a cleaned search string (A-Z, 0-9). Returns None when no
+    RegNo can start with it.
+    """
+    head, digits = prefix[:len(REG_PREFIX)], prefix[len(REG_PREFIX):]
+    if not REG_PREFIX.startswith(head):
+        return None
+    if len(digits) > REG_DIGITS or (digits and not digits.isdigit()):
+        return None
+
+    span = 10 ** (REG_DIGITS - len(digits))
+    lo = int(digits or 0) * span
+    return lo, lo + span
+
+
+def grade_categorical(grades):
+    """Grades as a categorical over the fixed grade order.
+
+    Grades outside ``GRADE_ORDER`` are appended as extra categories rather
+    than dropped, so the table still shows exactly what the PDF said.
+    """
+    grades = pd.Categorical(grades)
+    extras = sorted(set(grades.categories) - set(GRADE_DTYPE.categories))
+    dtype = GRADE_DTYPE
+    if extras:
+        dtype = pd.CategoricalDtype(list(GRADE_DTYPE.categories) + extras, ordered=True)
+    return grades.set_categories(dtype.categories, ordered=True)
@@ -0,0 +1,57 @@
+"""Sorted RegNo index for prefix search."""
+
+import numpy as np
+
+from .schema import REG_DTYPE, reg_no_code_range
+
+_NO_ROWS = np.empty(0, dtype=np.int64)
+
+
+class RegNoIndex:
+    """Binary-searchable RegNo index built once per parsed dataset.
+
+    RegNos are kept as sorted integer codes, so a prefix like ``IT2383``
+    becomes a contiguous code range found with two ``searchsorted`` calls.
+    ``lookup(prefix)`` returns the row positions whose RegNo starts with
+    ``prefix`` in O(log n + k), in ascending row order, so the result can be
+    passed straight to ``DataFrame.iloc`` and lists matches in the same
+    order as a ``str.startswith`` mask would.
+    """
+
+    def __init__(self, reg_codes):
+        reg_codes = np.asarray(reg_codes, dtype=REG_DTYPE)
+        order = np.argsort(reg_codes, kind="stable")
+
+        self._codes = reg_codes[order]
+        self._positions = order.astype(np.int64)
+
+    def __len__(self):
+        return len(self._codes)
+
+    @property
+    def nbytes(self):
+        return self._codes.nbytes + self._positions.nbytes
+
+    def lookup(self, prefix):
+        code_range = reg_no_code_range(prefix)
+        if code_range is None:
+            return _NO_ROWS
+
+        lo, hi = np.searchsorted(self._codes, code_range, side="left")
+        return np.sort(self._positions[lo:hi])
+
+    def reorder(self, order):
+        """Return an index over the same rows after they are rearranged.
+
+        ``order[i]`` is the original position of the row now at position
+        ``i`` (e.g. the index of a sorted frame before ``reset_index``).
+        The sorted codes are shared, only positions are remapped.
+        """
+        order = np.asarray(order, dtype=np.int64)
+        new_position = np.empty_like(order)
+        new_position[order] = np.arange(len(order), dtype=np.int64)
+
+        index = RegNoIndex.__new__(RegNoIndex)
+        index._codes = self._codes
+        index._positions = new_position[self._positions]
+        return index
@@ -0,0 +1,301 @@
+"""Persistent SQLite store of parsed results across modules.
+
+Rows are keyed by ``(module_code, reg_no)`` and indexed on ``reg_no``, so a
+student's history across every ingested module is one indexed query rather
+than re-parsing each PDF. Module ranks and per-student totals are kept at
+ingest, so lookups never scan other students' rows. Ingest is idempotent
+per file hash; ingesting a new file for a module that is already stored
+replaces that module's rows.
+
+Alongside the rows the store keeps the module's aggregate cube cells (see
+:mod:`marks_analyzer.cube`), replaced in the same transaction, so
+summaries across stored modules read a few cells per module instead of
+every result row.
+"""
+
+import sqlite3
+import time
+from contextlib import closing
+
+import pandas as pd
+
+from .classify import classify_ca_performance, grade_performance
+from .cube import CUBE_COLUMNS, cube_cells, summarize_cells
+from .grades import GRADE_MID, GRADE_ORDER
+from .pipeline import ranked_cells, ranked_table
+from .schema import decode_reg_nos, marks_for_arithmetic
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_hash     TEXT PRIMARY KEY,
+    module_code   TEXT NOT NULL,
+    module_name   TEXT NOT NULL,
+    has_ca_marks  INTEGER NOT NULL,
+    source_name   TEXT,
+    row_count     INTEGER NOT NULL,
+    ingested_at   REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS results (
+    module_code   TEXT NOT NULL,
+    reg_no        TEXT NOT NULL,
+    file_hash     TEXT NOT NULL REFERENCES files(file_hash),
+    ca_percent    REAL,
+    grade         TEXT NOT NULL,
+    status        TEXT NOT NULL,
+    grade_order   INTEGER,
+    approx_total  REAL,
+    module_rank   INTEGER,
+    PRIMARY KEY (module_code, reg_no)
+);
+
+CREATE INDEX IF NOT EXISTS idx_results_reg_no ON results (reg_no);
+
+CREATE TABLE IF NOT EXISTS cube (
+    module_code   TEXT NOT NULL,
+    grade         TEXT NOT NULL,
+    status        TEXT NOT NULL,
+    performance   TEXT NOT NULL,
+    students      INTEGER NOT NULL,
+    ca_students   INTEGER NOT NULL,
+    ca_sum        REAL NOT NULL,
+    ca_sumsq      REAL NOT NULL,
+    PRIMARY KEY (module_code, grade, status, performance)
+);
+
+CREATE TABLE IF NOT EXISTS student_totals (
+    reg_no        TEXT PRIMARY KEY,
+    total         REAL NOT NULL,     -- sum of grade-band midpoints
+    graded        INTEGER NOT NULL,  -- modules with a recognized grade
+    modules       INTEGER NOT NULL,
+    avg_total     REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_student_totals_avg ON student_totals (avg_total);
+"""
+
+CUBE_QUERY = """
+SELECT
+    module_code AS ModuleCode, grade AS Grade, status AS Status, performance AS Performance,
+    students AS Students, ca_students AS CAStudents, ca_sum AS CASum, ca_sumsq AS CASumSq
+FROM cube
+"""
+
+# Rank and cohort size are stored at ingest, so a student's history is an
+# indexed lookup on reg_no that never touches other students' rows
+HISTORY_QUERY = """
+SELECT
+    r.module_code AS ModuleCode,
+    f.module_name AS ModuleName,
+    r.ca_percent AS CAMarksPercent,
+    r.grade AS Grade,
+    r.status AS Status,
+    r.approx_total AS ScoreApprox,
+    r.module_rank AS Rank,
+    f.row_count AS CohortSize
+FROM results AS r
+JOIN files AS f ON f.file_hash = r.file_hash
+WHERE r.reg_no = ?
+ORDER BY r.module_code
+"""
+
+# Overall rank across modules by mean grade-band midpoint, from the
+# per-student totals kept at ingest; students with no recognized grade
+# (NULL average) share the last rank, as RANK() over AVG() gave them
+OVERALL_RANK_QUERY = """
+SELECT
+    1 + CASE
+        WHEN me.avg_total IS NULL THEN (SELECT COUNT(*) FROM student_totals WHERE avg_total IS NOT NULL)
+        ELSE (SELECT COUNT(*) FROM student_totals WHERE avg_total > me.avg_total)
+    END AS overall_rank,
+    (SELECT COUNT(*) FROM student_totals) AS students,
+    me.avg_total,
+    me.modules
+FROM student_totals AS me
+WHERE me.reg_no = ?
+"""
+
+# Adds a module's contribution to (or, negated, removes it from) each student's totals
+ADD_STUDENT_TOTALS = """
+INSERT INTO student_totals (reg_no, total, graded, modules) VALUES (?, ?, ?, ?)
+ON CONFLICT (reg_no) DO UPDATE SET
+    total = total + excluded.total,
+    graded = graded + excluded.graded,
+    modules = modules + excluded.modules
+"""
+
+SET_STUDENT_AVERAGE = """
+UPDATE student_totals SET avg_total = CASE WHEN graded > 0 THEN total / graded END WHERE reg_no = ?
+"""
+
+
+class ResultsStore:
+    """Local SQLite database of every ingested result sheet."""
+
+    def __init__(self, path):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+            with conn:
+                self._add_missing_columns(conn)
+                self._backfill_ranks(conn)
+                self._backfill_cube(conn)
+                self._backfill_student_totals(conn)
+
+    def _connect(self):
+        # One short-lived connection per call keeps the store safe to use
+        # from Streamlit's per-session threads
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def _add_missing_columns(conn):
+        # Databases written before module ranks were stored
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+        if "module_rank" not in columns:
+            conn.execute("ALTER TABLE results ADD COLUMN module_rank INTEGER")
+
+    @staticmethod
+    def _write_cube(conn, cells):
+        conn.executemany(
+            "INSERT INTO cube VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            cells[CUBE_COLUMNS].itertuples(index=False, name=None),
+        )
+
+    def _backfill_cube(self, conn):
+        # Databases written before the cube existed: build cells for the
+        # modules that have rows but no cells, from the stored rows
+        missing = [code for (code,) in conn.execute(
+            "SELECT module_code FROM files WHERE module_code NOT IN (SELECT module_code FROM cube)"
+        )]
+        for module_code in missing:
+            df = pd.read_sql_query(
+                "SELECT ca_percent AS CAMarksPercent, grade AS Grade, status AS Status "
+                "FROM results WHERE module_code = ?",
+                conn, params=(module_code,),
+            )
+            has_ca_marks = bool(df["CAMarksPercent"].notna().any())
+            if has_ca_marks:
+                df["Performance"] = classify_ca_performance(df["CAMarksPercent"], df["Grade"])
+            else:
+                df["Performance"] = grade_performance(df["Grade"])
+            self._write_cube(conn, cube_cells(df, module_code, has_ca_marks))
+
+    @staticmethod
+    def _backfill_ranks(conn):
+        # Rows ingested before ranks were stored: the app's ordering without
+        # its PDF-order tie-break, which is no longer known
+        ranks = conn.execute(
+            "SELECT ROW_NUMBER() OVER (PARTITION BY module_code "
+            "ORDER BY ca_percent DESC, grade_order NULLS LAST, reg_no), rowid "
+            "FROM results WHERE module_code IN (SELECT module_code FROM results WHERE module_rank IS NULL)"
+        ).fetchall()
+        conn.executemany("UPDATE results SET module_rank = ? WHERE rowid = ?", ranks)
+
+    @staticmethod
+    def _backfill_student_totals(conn):
+        # Databases written before per-student totals were kept
+        if conn.execute("SELECT 1 FROM student_totals LIMIT 1").fetchone():
+            return
+        conn.execute(
+            "INSERT INTO student_totals "
+            "SELECT reg_no, COALESCE(SUM(approx_total), 0), COUNT(approx_total), COUNT(*), AVG(approx_total) "
+            "FROM results GROUP BY reg_no"
+        )
+
+    @staticmethod
+    def _update_student_totals(conn, old_rows, new_rows):
+        # Only the students of the replaced module change
+        deltas = {}
+        for sign, rows in ((-1, old_rows), (1, new_rows)):
+            for reg_no, approx_total in rows:
+                total, graded, modules = deltas.get(reg_no, (0.0, 0, 0))
+                if approx_total is not None:
+                    total, graded = total + sign * approx_total, graded + sign
+                deltas[reg_no] = (total, graded, modules + sign)
+
+        conn.executemany(ADD_STUDENT_TOTALS, [(reg_no, *delta) for reg_no, delta in deltas.items()])
+        conn.executemany(SET_STUDENT_AVERAGE, [(reg_no,) for reg_no in deltas])
+        conn.execute("DELETE FROM student_totals WHERE modules <= 0")
+
+    def ingest(self, file_hash, parsed, source_name=None):
+        """Store the rows of ``parsed``; returns False if this file was already ingested."""
+        # Ranked exactly as the app ranks the sheet, so Module History agrees
+        # with the report
+        ranked = ranked_table(parsed)
+        df = ranked.df
+        ca_values = (
+            marks_for_arithmetic(df["CAMarksPercent"]).tolist() if parsed.has_ca_marks
+            else [None] * len(df)
+        )
+        rows = [
+            (parsed.module_code, reg_no, file_hash, ca, grade, status,
+             GRADE_ORDER.get(grade), GRADE_MID.get(grade), rank)
+            for reg_no, ca, grade, status, rank in zip(
+                decode_reg_nos(df["RegNo"]), ca_values, df["Grade"], df["Status"], df["Rank"].tolist()
+            )
+        ]
+
+        with closing(self._connect()) as conn, conn:
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (file_hash, parsed.module_code, parsed.module_name, int(parsed.has_ca_marks),
+                 source_name, len(rows), time.time()),
+            ).rowcount
+            if not inserted:
+                return False
+
+            old_totals = conn.execute(
+                "SELECT reg_no, approx_total FROM results WHERE module_code = ?", (parsed.module_code,)
+            ).fetchall()
+
+            # A newer sheet for the same module replaces the old one wholesale
+            conn.execute("DELETE FROM results WHERE module_code = ?", (parsed.module_code,))
+            conn.execute(
+                "DELETE FROM files WHERE module_code = ? AND file_hash != ?",
+                (parsed.module_code, file_hash),
+            )
+            conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            # A RegNo repeated on the sheet is stored once, with its last row
+            new_totals = {row[1]: row[7] for row in rows}
+            self._update_student_totals(conn, old_totals, new_totals.items())
+
+            # Swap the module's cube cells; other modules' cells are untouched
+            conn.execute("DELETE FROM cube WHERE module_code = ?", (parsed.module_code,))
+            self._write_cube(conn, ranked_cells(ranked, parsed))
+        return True
+
+    def modules(self):
+        """DataFrame of the stored modules and the file each one came from."""
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(
+                "SELECT module_code AS ModuleCode, module_name AS ModuleName, "
+                "has_ca_marks AS HasCAMarks, row_count AS Students, source_name AS SourceName "
+                "FROM files ORDER BY module_code",
+                conn,
+            )
+
+    def cube(self, modules=None):
+        """Aggregate cube cells of ``modules`` (every stored module when None)."""
+        query, params = CUBE_QUERY, ()
+        if modules is not None:
+            modules = list(modules)
+            query += f"WHERE module_code IN ({', '.join('?' * len(modules))})"
+            params = modules
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(query, conn, params=params)
+
+    def summary(self, modules=None):
+        """Counts and averages across ``modules``, read from the cube (see :func:`~marks_analyzer.cube.summarize_cells`)."""
+        return summarize_cells(self.cube(modules))
+
+    def student_history(self, reg_no):
+        """Every stored module result for ``reg_no`` with its rank in that module."""
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(HISTORY_QUERY, conn, params=(reg_no,))
+
+    def overall_rank(self, reg_no):
+        """``(rank, students, average_total, modules)`` by mean grade midpoint, or None."""
+        with closing(self._connect()) as conn:
+            return conn.execute(OVERALL_RANK_QUERY, (reg_no,)).fetchone()
@@ -0,0 +1,138 @@
+"""Per-stage timing instrumentation and an optional cProfile hook.
+
+A :class:`StageTimer` collects wall time, RSS delta and page/row counts for
+each named pipeline stage. Re-entering a stage accumulates into the same
+record, so per-page work (extraction, regex parsing) adds up to one line.
+``log()`` emits every record as a structured JSON log line.
+
+Setting ``SLIIT_PROFILE_DIR`` makes :func:`start_profiler` /
+:func:`save_profile` wrap a run in cProfile and write a ``.prof`` file
+there for offline analysis (``python -m pstats <file>``).
+"""
+
+import cProfile
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("marks_analyzer.timing")
+
+PROFILE_DIR_ENV = "SLIIT_PROFILE_DIR"
+
+
+def _rss_bytes():
+    """Current resident set size, or None where it cannot be read cheaply."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # Peak rather than current RSS off Linux; KB on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if os.uname().sysname == "Darwin" else maxrss * 1024
+
+
+class StageTimer:
+    """Collects timings for the stages of one analysis run."""
+
+    def __init__(self, run_id=None):
+        self.run_id = run_id
+        self.records = {}
+
+    @contextmanager
+    def stage(self, name, **fields):
+        """Time the enclosed block; set ``pages`` / ``rows`` on the yielded dict."""
+        info = dict(fields)
+        rss_before = _rss_bytes()
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            seconds = time.perf_counter() - start
+            rss_after = _rss_bytes()
+            mem_delta = None
+            if rss_before is not None and rss_after is not None:
+                mem_delta = (rss_after - rss_before) / 2**20
+            self._accumulate(name, seconds, mem_delta, info)
+
+    def timed_iter(self, name, iterable):
+        """Yield from ``iterable``, charging the time spent producing items to ``name``."""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name) as info:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                info["pages"] = 1
+            yield item
+
+    def _accumulate(self, name, seconds, mem_delta, info):
+        record = self.records.setdefault(
+            name, {"stage": name, "seconds": 0.0, "mem_delta_mb": None, "pages": None, "rows": None}
+        )
+        record["seconds"] += seconds
+        if mem_delta is not None:
+            record["mem_delta_mb"] = (record["mem_delta_mb"] or 0.0) + mem_delta
+        for key, value in info.items():
+            if isinstance(value, (int, float)) and isinstance(record.get(key), (int, float)):
+                record[key] += value
+            else:
+                record[key] = value
+
+    @property
+    def total_seconds(self):
+        return sum(r["seconds"] for r in self.records.values())
+
+    def as_frame(self):
+        import pandas as pd
+
+        columns = ["stage", "seconds", "mem_delta_mb", "pages", "rows"]
+        return pd.DataFrame(list(self.records.values()), columns=columns)
+
+    def log(self, level=logging.INFO):
+        for record in self.records.values():
+            logger.log(level, json.dumps({"event": "stage", "run": self.run_id, **record}))
+
+
+class NullTimer(StageTimer):
+    """Drop-in timer that records nothing, used when no timer is passed."""
+
+    @contextmanager
+    def stage(self, name, **fields):
+        yield dict(fields)
+
+    def timed_iter(self, name, iterable):
+        return iter(iterable)
+
+
+def start_profiler():
+    """Start cProfile for this run if ``SLIIT_PROFILE_DIR`` is set; returns the profiler or None."""
+    if not os.environ.get(PROFILE_DIR_ENV):
+        return None
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def save_profile(profiler, name="run"):
+    """Stop ``profiler`` and dump its stats into ``SLIIT_PROFILE_DIR``; returns the file path."""
+    if profiler is None:
+        return None
+
+    profiler.disable()
+    directory = os.environ[PROFILE_DIR_ENV]
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S") + f"{int(time.time() * 1000) % 1000:03d}"
+    path = os.path.join(directory, f"{name}-{stamp}-{os.getpid()}.prof")
+    profiler.dump_stats(path)
+    logger.info(json.dumps({"event": "profile", "path": path}))
+    return path
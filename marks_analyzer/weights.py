@@ -0,0 +1,25 @@
+"""CA / final exam weightings for known SLIIT modules."""
+
+# Module weight settings
+SIXTY_FORTY = {"IT1010", "IT1050", "IT1090", "IT2020", "IT2060", "IT2050", "IT2070", "IT2090"}
+FIFTY_FIFTY = {"IT1020", "IT1030", "IT1040", "IT1060", "IT1080", "IT1100", "IT2030", "IT2040", "IT2010", "IT2110"}
+
+# Session default for modules that are not in either table
+DEFAULT_CA_WEIGHT_PERCENT = 40
+
+
+def module_weights(module_code, custom_ca_weight_percent=None):
+    """Return ``(ca_weight, final_weight)`` as fractions for ``module_code``.
+
+    Unknown modules use ``custom_ca_weight_percent``; ``None`` is returned
+    when the module is unknown and no custom weight is given.
+    """
+    if module_code in SIXTY_FORTY:
+        return 0.4, 0.6
+    if module_code in FIFTY_FIFTY:
+        return 0.5, 0.5
+    if custom_ca_weight_percent is None:
+        return None
+
+    ca_weight = custom_ca_weight_percent / 100
+    return ca_weight, 1.0 - ca_weight